@@ -32,35 +32,60 @@ def create_app():
     mcp = FastMCP("Podcast MCP")
     
     # Register tools using the new service architecture
-    @mcp.tool(description="Transcribe audio files to text using Whisper model with speaker diarization support")
+    @mcp.tool(description=mcp_tools.TOOL_REGISTRY["transcribe_audio_file"]["description"])
     async def transcribe_audio_file_tool(
         audio_file_path: str,
         model_size: str = "turbo",
         language: str = None,
         output_format: str = "srt",
-        enable_speaker_diarization: bool = False
+        enable_speaker_diarization: bool = False,
+        save_debug_json: bool = False,
+        output_formats: list[str] = None
     ):
         return await mcp_tools.transcribe_audio_file(
-            audio_file_path, model_size, language, output_format, enable_speaker_diarization
+            audio_file_path, model_size, language, output_format, enable_speaker_diarization,
+            save_debug_json, output_formats
         )
     
-    @mcp.tool(description="Download Apple Podcast audio files")
+    @mcp.tool(description=mcp_tools.TOOL_REGISTRY["transcribe_audio_files"]["description"])
+    async def transcribe_audio_files_tool(
+        audio_file_paths: list[str],
+        model_size: str = "turbo",
+        language: str = None,
+        output_format: str = "srt",
+        enable_speaker_diarization: bool = False,
+        max_concurrent: int = 5
+    ):
+        return await mcp_tools.transcribe_audio_files(
+            audio_file_paths, model_size, language, output_format, enable_speaker_diarization,
+            max_concurrent
+        )
+    
+    @mcp.tool(description=mcp_tools.TOOL_REGISTRY["download_apple_podcast"]["description"])
     async def download_apple_podcast_tool(url: str):
         return await mcp_tools.download_apple_podcast(url)
     
-    @mcp.tool(description="Download XiaoYuZhou podcast audio files")
+    @mcp.tool(description=mcp_tools.TOOL_REGISTRY["download_apple_podcasts"]["description"])
+    async def download_apple_podcasts_tool(urls: list[str], max_concurrent: int = 3):
+        return await mcp_tools.download_apple_podcasts(urls, max_concurrent)
+    
+    @mcp.tool(description=mcp_tools.TOOL_REGISTRY["download_xyz_podcast"]["description"])
     async def download_xyz_podcast_tool(url: str):
         return await mcp_tools.download_xyz_podcast(url)
     
-    @mcp.tool(description="Scan directory for MP3 audio files")
+    @mcp.tool(description=mcp_tools.TOOL_REGISTRY["get_mp3_files"]["description"])
     async def get_mp3_files_tool(directory: str):
         return await mcp_tools.get_mp3_files(directory)
     
-    @mcp.tool(description="Get basic file information")
+    @mcp.tool(description=mcp_tools.TOOL_REGISTRY["get_file_info"]["description"])
     async def get_file_info_tool(file_path: str):
         return await mcp_tools.get_file_info(file_path)
     
-    @mcp.tool(description="Read text file content in segments")
+    @mcp.tool(description=mcp_tools.TOOL_REGISTRY["get_file_info_batch"]["description"])
+    async def get_file_info_batch_tool(file_paths: list[str]):
+        return await mcp_tools.get_file_info_batch(file_paths)
+    
+    @mcp.tool(description=mcp_tools.TOOL_REGISTRY["read_text_file_segments"]["description"])
     async def read_text_file_segments_tool(
         file_path: str,
         chunk_size: int = 65536,
@@ -68,12 +93,18 @@ def create_app():
     ):
         return await mcp_tools.read_text_file_segments(file_path, chunk_size, start_position)
     
+    @asynccontextmanager
+    async def lifespan(app):
+        async with mcp.session_manager.run():
+            yield
+        await mcp_tools.shutdown()
+    
     # Create FastAPI wrapper
     fastapi_wrapper = FastAPI(
         title="Modal AudioTranscriber MCP",
         description="Gradio UI + FastMCP Tool + Modal Integration AudioTranscriber MCP",
         version="1.0.0",
-        lifespan=lambda app: mcp.session_manager.run()
+        lifespan=lifespan
     )
     
     # Get FastMCP's streamable HTTP app
@@ -55,6 +55,27 @@ def download_models() -> None:
     whisper_model = whisper.load_model("turbo", download_root="/model")
     print("✅ Whisper turbo model downloaded and cached")
     
+    # CTranslate2 weights used by TranscriptionService when faster-whisper is installed,
+    # quantized to int8 once here so containers load them without converting at runtime
+    try:
+        import ctranslate2
+        
+        print("📥 Converting Whisper turbo model to CTranslate2 int8...")
+        converter = ctranslate2.converters.TransformersConverter(
+            "openai/whisper-large-v3-turbo",
+            copy_files=["tokenizer.json", "preprocessor_config.json"]
+        )
+        converter.convert("/model/turbo-ct2", quantization="int8_float16", force=True)
+        print("✅ CTranslate2 int8 turbo model cached")
+    except Exception as e:
+        print(f"⚠️ Failed to convert CTranslate2 model, caching the published weights: {e}")
+        try:
+            from faster_whisper import WhisperModel
+            WhisperModel("turbo", device="cpu", compute_type="int8", download_root="/model")
+            print("✅ faster-whisper turbo model downloaded and cached")
+        except Exception as e:
+            print(f"⚠️ Failed to download faster-whisper model: {e}")
+    
     # Download speaker diarization models if HF token is available
     if os.environ.get("HF_TOKEN"):
         try:
@@ -162,6 +183,8 @@ image = modal.Image.debian_slim(python_version="3.11").apt_install(
     "requests",
     # Whisper and audio processing related
     "git+https://github.com/openai/whisper.git",
+    "faster-whisper>=1.1.0",
+    "transformers",  # Needed by the CTranslate2 converter at image build time
     "ffmpeg-python",
     "torchaudio==2.1.0",
     "numpy<2",
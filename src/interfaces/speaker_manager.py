@@ -3,7 +3,7 @@ Speaker identification and embedding management interfaces
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Set, Tuple
 from dataclasses import dataclass
 import numpy as np
 
@@ -36,7 +36,8 @@ class ISpeakerEmbeddingManager(ABC):
     async def find_matching_speaker(
         self,
         embedding: np.ndarray,
-        source_file: str
+        source_file: str,
+        forbid_merge_set: Optional[Set[str]] = None
     ) -> Optional[str]:
         """Find matching speaker from existing embeddings"""
         pass
@@ -47,7 +48,9 @@ class ISpeakerEmbeddingManager(ABC):
         embedding: np.ndarray,
         source_file: str,
         confidence: float = 1.0,
-        original_label: Optional[str] = None
+        original_label: Optional[str] = None,
+        now_iso: Optional[str] = None,
+        forbid_merge_set: Optional[Set[str]] = None
     ) -> str:
         """Add new speaker or update existing speaker"""
         pass
@@ -4,10 +4,13 @@ File Management Service - handles audio file and text file operations
 
 import os
 import asyncio
+import codecs
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+import aiofiles
+
 from ..utils.errors import FileProcessingError
 
 
@@ -31,24 +34,30 @@ class FileManagementService:
             if not scan_path.is_dir():
                 raise FileProcessingError(f"Path is not a directory: {directory}")
             
-            mp3_files = []
+            def collect_mp3_files() -> List[Dict[str, Any]]:
+                mp3_files = []
+                
+                # Scan for MP3 files
+                for file_path in scan_path.rglob("*.mp3"):
+                    try:
+                        stat = file_path.stat()
+                        file_info = {
+                            "filename": file_path.name,
+                            "full_path": str(file_path.absolute()),
+                            "file_size": stat.st_size,
+                            "file_size_mb": round(stat.st_size / (1024 * 1024), 2),
+                            "created_time": datetime.fromtimestamp(stat.st_ctime).strftime("%Y-%m-%d %H:%M:%S"),
+                            "modified_time": datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S")
+                        }
+                        mp3_files.append(file_info)
+                    except Exception as e:
+                        print(f"⚠️ Error processing file {file_path}: {e}")
+                        continue
+                
+                return mp3_files
             
-            # Scan for MP3 files
-            for file_path in scan_path.rglob("*.mp3"):
-                try:
-                    stat = file_path.stat()
-                    file_info = {
-                        "filename": file_path.name,
-                        "full_path": str(file_path.absolute()),
-                        "file_size": stat.st_size,
-                        "file_size_mb": round(stat.st_size / (1024 * 1024), 2),
-                        "created_time": datetime.fromtimestamp(stat.st_ctime).strftime("%Y-%m-%d %H:%M:%S"),
-                        "modified_time": datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S")
-                    }
-                    mp3_files.append(file_info)
-                except Exception as e:
-                    print(f"⚠️ Error processing file {file_path}: {e}")
-                    continue
+            # The recursive walk blocks, so it runs in a worker thread
+            mp3_files = await asyncio.to_thread(collect_mp3_files)
             
             # Sort by modification time (newest first)
             mp3_files.sort(key=lambda x: x["modified_time"], reverse=True)
@@ -215,64 +224,64 @@ class FileManagementService:
                     "actual_boundary": "end_of_file"
                 }
             
-            with open(path, 'r', encoding='utf-8') as f:
-                f.seek(start_position)
-                
-                # Read the chunk
-                raw_content = f.read(chunk_size)
-                
-                if not raw_content:
-                    return {
-                        "status": "success",
-                        "file_path": file_path,
-                        "content": "",
-                        "current_position": file_size,
-                        "file_size": file_size,
-                        "end_of_file_reached": True,
-                        "bytes_read": 0,
-                        "content_length": 0,
-                        "progress_percentage": 100.0,
-                        "actual_boundary": "end_of_file"
-                    }
-                
-                # Find intelligent boundary
-                boundary_type = "chunk_boundary"
-                actual_content = raw_content
-                bytes_read = len(raw_content.encode('utf-8'))
-                
-                if len(raw_content) == chunk_size:
-                    # Look for newline boundary
-                    last_newline = raw_content.rfind('\n')
-                    if last_newline > chunk_size * 0.5:  # At least half the chunk
-                        actual_content = raw_content[:last_newline + 1]
-                        boundary_type = "newline_boundary"
-                    else:
-                        # Look for space boundary
-                        last_space = raw_content.rfind(' ')
-                        if last_space > chunk_size * 0.7:  # At least 70% of chunk
-                            actual_content = raw_content[:last_space + 1]
-                            boundary_type = "space_boundary"
-                
-                # Calculate actual position
-                actual_bytes_read = len(actual_content.encode('utf-8'))
-                current_position = start_position + actual_bytes_read
-                
-                # Check if end of file reached
-                end_of_file_reached = current_position >= file_size
-                
+            # Read bytes without blocking the event loop; a multi-byte character cut
+            # off at the end of the chunk is left for the next read
+            async with aiofiles.open(path, 'rb') as f:
+                await f.seek(start_position)
+                raw_bytes = await f.read(chunk_size)
+            raw_content = codecs.getincrementaldecoder('utf-8')().decode(raw_bytes)
+            
+            if not raw_content:
                 return {
                     "status": "success",
                     "file_path": file_path,
-                    "content": actual_content,
-                    "current_position": current_position,
+                    "content": "",
+                    "current_position": file_size,
                     "file_size": file_size,
-                    "end_of_file_reached": end_of_file_reached,
-                    "bytes_read": actual_bytes_read,
-                    "content_length": len(actual_content),
-                    "progress_percentage": round((current_position / file_size) * 100, 2),
-                    "actual_boundary": boundary_type
+                    "end_of_file_reached": True,
+                    "bytes_read": 0,
+                    "content_length": 0,
+                    "progress_percentage": 100.0,
+                    "actual_boundary": "end_of_file"
                 }
-                
+            
+            # Find intelligent boundary
+            boundary_type = "chunk_boundary"
+            actual_content = raw_content
+            
+            if len(raw_bytes) == chunk_size:
+                # Look for newline boundary
+                last_newline = raw_content.rfind('\n')
+                if last_newline > len(raw_content) * 0.5:  # At least half the chunk
+                    actual_content = raw_content[:last_newline + 1]
+                    boundary_type = "newline_boundary"
+                else:
+                    # Look for space boundary
+                    last_space = raw_content.rfind(' ')
+                    if last_space > len(raw_content) * 0.7:  # At least 70% of chunk
+                        actual_content = raw_content[:last_space + 1]
+                        boundary_type = "space_boundary"
+            
+            # Calculate actual position
+            actual_bytes_read = len(actual_content.encode('utf-8'))
+            current_position = start_position + actual_bytes_read
+            
+            # Check if end of file reached
+            end_of_file_reached = current_position >= file_size
+            
+            return {
+                "status": "success",
+                "file_path": file_path,
+                "content": actual_content,
+                "current_position": current_position,
+                "file_size": file_size,
+                "end_of_file_reached": end_of_file_reached,
+                "bytes_read": actual_bytes_read,
+                "content_length": len(actual_content),
+                "progress_percentage": round((current_position / file_size) * 100, 2),
+                "actual_boundary": boundary_type
+            }
+            
         except Exception as e:
             return {
                 "status": "failed",
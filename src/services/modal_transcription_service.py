@@ -7,7 +7,7 @@ import asyncio
 import aiohttp
 import base64
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from pathlib import Path
 
 
@@ -39,6 +39,10 @@ class ModalTranscriptionService:
         }
         self.cache_dir = cache_dir or "/tmp"
         
+        # HTTP session reused across endpoint calls, created on first use
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        
         # Determine if we're running in Modal environment
         if self.use_direct_modal_calls:
             print("✅ Using direct function calls (no HTTP endpoints)")
@@ -125,23 +129,10 @@ class ModalTranscriptionService:
             if not self.use_direct_modal_calls:
                 # HTTP endpoint call (fallback)
                 endpoint_url = self.endpoint_urls["transcribe_audio"]
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                        endpoint_url,
-                        json=request_data,
-                        timeout=aiohttp.ClientTimeout(total=3600)  # 1 hour timeout
-                    ) as response:
-                        if response.status == 200:
-                            result = await response.json()
-                            print(f"✅ Transcription completed successfully via HTTP endpoint")
-                            self._log_transcription_results(result, enable_speaker_diarization)
-                            return result
-                        else:
-                            error_text = await response.text()
-                            return {
-                                "processing_status": "failed",
-                                "error_message": f"HTTP {response.status}: {error_text}"
-                            }
+                session = await self._get_session()
+                return await self._post_transcription_request(
+                    session, endpoint_url, request_data, enable_speaker_diarization
+                )
                         
         except Exception as e:
             return {
@@ -149,6 +140,49 @@ class ModalTranscriptionService:
                 "error_message": f"Transcription request failed: {e}"
             }
     
+    async def _post_transcription_request(
+        self,
+        session: aiohttp.ClientSession,
+        endpoint_url: str,
+        request_data: Dict[str, Any],
+        enable_speaker_diarization: bool
+    ) -> Dict[str, Any]:
+        """Send one transcription request to the HTTP endpoint"""
+        async with session.post(
+            endpoint_url,
+            json=request_data,
+            timeout=aiohttp.ClientTimeout(total=3600)  # 1 hour timeout
+        ) as response:
+            if response.status == 200:
+                result = await response.json()
+                print(f"✅ Transcription completed successfully via HTTP endpoint")
+                self._log_transcription_results(result, enable_speaker_diarization)
+                return result
+            else:
+                error_text = await response.text()
+                return {
+                    "processing_status": "failed",
+                    "error_message": f"HTTP {response.status}: {error_text}"
+                }
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use"""
+        loop = asyncio.get_running_loop()
+        # A session is bound to the loop it was created on, so callers on
+        # another loop (e.g. UI worker threads) get their own
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            self._session = aiohttp.ClientSession()
+            self._session_loop = loop
+        return self._session
+    
+    async def close(self) -> None:
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            if self._session_loop is asyncio.get_running_loop():
+                await self._session.close()
+        self._session = None
+        self._session_loop = None
+    
     async def transcribe_chunk(
         self,
         chunk_path: str,
@@ -4,15 +4,16 @@ Podcast Download Service - unified download functionality for multiple platforms
 
 import os
 import re
+import json
 import asyncio
-import subprocess
+import logging
 import pathlib
-from typing import Dict, Any, Optional
+import shutil
+import weakref
+from functools import lru_cache
+from typing import Dict, Any, Optional, TYPE_CHECKING
 from urllib.parse import urlparse
 
-import requests
-from bs4 import BeautifulSoup
-
 from ..interfaces.podcast_downloader import (
     IPodcastDownloader,
     PodcastInfo,
@@ -22,6 +23,135 @@ from ..interfaces.podcast_downloader import (
 from ..utils.errors import FileProcessingError, ConfigurationError
 from ..models.download import DownloadResponse
 
+# HTML/HTTP libraries are imported where they are used to keep service import
+# (and serverless cold starts) cheap for callers that never scrape pages
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+
+# Files at least this large are downloaded over several ranged connections
+PARALLEL_DOWNLOAD_MIN_BYTES = 16 * 1024 * 1024
+PARALLEL_DOWNLOAD_CHUNKS = 4
+# Ranged downloads buffer this much per connection before each (threaded) disk write
+RANGE_WRITE_BUFFER_BYTES = 1024 * 1024
+
+# Conversions are CPU-bound, so concurrent downloads share a cap on running ffmpeg
+# processes; page scraping and network transfers are not limited by it
+FFMPEG_CONCURRENCY = max(1, (os.cpu_count() or 2) // 2)
+# A semaphore binds to the loop that first waits on it, so each loop gets its own
+_ffmpeg_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# CSS selectors tried in order when looking for an episode title
+APPLE_TITLE_SELECTORS = (
+    'span.product-header__title',
+    'h1.product-header__title',
+    '.product-header__title',
+    'h1[data-testid="product-header-title"]',
+    '.headings__title',
+    'h1.headings__title',
+    '.episode-title',
+    'h1'
+)
+
+XYZ_TITLE_SELECTORS = (
+    'h1[data-v-]',
+    '.episode-title',
+    'h1',
+    '.title'
+)
+
+# Audio URLs embedded in page HTML; '=' may appear in signed paths and queries
+_AUDIO_URL_RE = re.compile(r'https://[^\s"\']+(?:\.mp3|\.m4a)')
+
+# CDN URL wrapped in a tracking redirect such as "...?url=https://cdn/episode.mp3"
+_WRAPPED_AUDIO_URL_RE = re.compile(r'=(https?://[^\s"\']+(?:\.mp3|\.m4a))')
+
+# MP3 URLs (with any query string) inside inline <script> data
+_MP3_SCRIPT_RE = re.compile(r'https://[^\s"\']+\.mp3[^\s"\']*')
+
+
+def _fast_copy(src: str, dst: str) -> None:
+    """Copy a file letting the kernel move the pages where the platform allows it"""
+    
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        size = os.fstat(fsrc.fileno()).st_size
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        
+        for kernel_copy in ("copy_file_range", "sendfile"):
+            copy_fn = getattr(os, kernel_copy, None)
+            if copy_fn is None:
+                continue
+            
+            try:
+                copied = 0
+                while copied < size:
+                    if kernel_copy == "copy_file_range":
+                        sent = copy_fn(src_fd, dst_fd, size - copied)
+                    else:
+                        sent = copy_fn(dst_fd, src_fd, copied, size - copied)
+                    if sent == 0:
+                        break
+                    copied += sent
+                if copied == size:
+                    return
+            except OSError:
+                pass
+            
+            # Partial or unsupported kernel copy: restart from scratch
+            os.lseek(src_fd, 0, os.SEEK_SET)
+            os.lseek(dst_fd, 0, os.SEEK_SET)
+            os.ftruncate(dst_fd, 0)
+        
+        shutil.copyfileobj(fsrc, fdst, 1024 * 1024)
+
+
+def _ffmpeg_semaphore() -> asyncio.Semaphore:
+    """Semaphore capping ffmpeg processes started from the running event loop"""
+    loop = asyncio.get_running_loop()
+    semaphore = _ffmpeg_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _ffmpeg_semaphores[loop] = asyncio.Semaphore(FFMPEG_CONCURRENCY)
+    return semaphore
+
+
+def _pwrite_all(fd: int, data: bytes, offset: int) -> None:
+    """Write all of data at offset, continuing after partial writes"""
+    view = memoryview(data)
+    while view:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
+
+
+@lru_cache(maxsize=32)
+def _compile_selectors(selectors: tuple) -> tuple:
+    """Compile a selector list once so repeated extractions skip CSS parsing"""
+    import soupsieve
+    return tuple(soupsieve.compile(selector) for selector in selectors)
+
+
+# Host substring -> platform, checked in order
+_HOST_TABLE = (
+    ("podcasts.apple.com", PodcastPlatform.APPLE),
+    ("xiaoyuzhoufm.com", PodcastPlatform.XIAOYUZHOU),
+)
+
+
+@lru_cache(maxsize=1024)
+def _detect_platform_cached(url: str) -> PodcastPlatform:
+    """Detect platform from URL (pure, so results are memoized per URL)"""
+    
+    # Match against the host only; scheme-less URLs have no netloc, so fall back to the full string
+    host = urlparse(url).netloc or url
+    for host_fragment, platform in _HOST_TABLE:
+        if host_fragment in host:
+            return platform
+    return PodcastPlatform.GENERIC
+
 
 class PodcastDownloadService(IPodcastDownloader):
     """Unified podcast download service supporting multiple platforms"""
@@ -105,31 +235,29 @@ class PodcastDownloadService(IPodcastDownloader):
     
     def _detect_platform(self, url: str) -> PodcastPlatform:
         """Detect platform from URL"""
-        
-        if "podcasts.apple.com" in url:
-            return PodcastPlatform.APPLE
-        elif "xiaoyuzhoufm.com" in url:
-            return PodcastPlatform.XIAOYUZHOU
-        else:
-            return PodcastPlatform.GENERIC
+        return _detect_platform_cached(url)
     
     async def _extract_apple_info(self, url: str) -> PodcastInfo:
         """Extract Apple Podcast information"""
         
+        import requests
+        from bs4 import BeautifulSoup
+        
         loop = asyncio.get_event_loop()
         response = await loop.run_in_executor(None, requests.get, url)
         
         if response.status_code != 200:
             raise FileProcessingError(f"Failed to fetch podcast page: {response.status_code}")
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        html = response.text
         
-        # Find audio URL
-        audio_url = self._find_audio_url_in_html(response.text)
+        # Find audio URL with a plain regex scan before paying for a parse tree
+        audio_url = self._find_audio_url_in_html(html)
         if not audio_url:
             raise FileProcessingError("Unable to find podcast audio URL")
         
         # Find title
+        soup = BeautifulSoup(html, 'html.parser')
         title = self._extract_apple_title(soup)
         if not title:
             raise FileProcessingError("Unable to find podcast title")
@@ -147,6 +275,8 @@ class PodcastDownloadService(IPodcastDownloader):
     async def _extract_xiaoyuzhou_info(self, url: str) -> PodcastInfo:
         """Extract XiaoYuZhou Podcast information"""
         
+        import requests
+        
         loop = asyncio.get_event_loop()
         
         # Use similar extraction logic as original
@@ -183,22 +313,16 @@ class PodcastDownloadService(IPodcastDownloader):
             # Extract podcast info
             podcast_info = await self._extract_apple_info(url)
             
-            # Generate output filename
+            # Generate output filename; keep the source container's extension
+            # so conversion can tell whether re-encoding is actually needed
             output_file = self._generate_filename(
                 podcast_info.episode_id,
                 podcast_info.audio_url,
-                output_folder,
-                convert_to_mp3
+                output_folder
             )
             
             # Download audio file
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None,
-                self._download_file,
-                podcast_info.audio_url,
-                output_file
-            )
+            await self._download_file_async(podcast_info.audio_url, output_file)
             
             # Convert to MP3 if requested
             if convert_to_mp3:
@@ -258,55 +382,17 @@ class PodcastDownloadService(IPodcastDownloader):
     async def _download_xiaoyuzhou_episode(self, url: str, output_folder: str) -> tuple[str, str]:
         """Download XiaoYuZhou episode using Selenium"""
         
-        from selenium import webdriver
-        from selenium.webdriver.chrome.options import Options
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.support.ui import WebDriverWait
-        from selenium.webdriver.support import expected_conditions as EC
         from bs4 import BeautifulSoup
-        import requests
-        import json
-        import os
-        import time
-        
-        # Setup Chrome options
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
         
-        # Initialize driver
-        driver = None
         try:
-            driver = webdriver.Chrome(options=chrome_options)
-            driver.get(url)
-            
-            # Wait for page to load
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            
-            # Wait a bit more for JavaScript to execute
-            time.sleep(3)
-            
-            # Get page source
-            page_source = driver.page_source
+            # Selenium is blocking; run it in a worker thread so the loop stays free
+            page_source = await asyncio.to_thread(self._render_xiaoyuzhou_page, url)
             soup = BeautifulSoup(page_source, 'html.parser')
             
             # Extract episode title
             title = "Unknown Episode"
-            title_selectors = [
-                'h1[data-v-]',
-                '.episode-title',
-                'h1',
-                '.title'
-            ]
-            
-            for selector in title_selectors:
-                title_elem = soup.select_one(selector)
+            for selector in _compile_selectors(XYZ_TITLE_SELECTORS):
+                title_elem = selector.select_one(soup)
                 if title_elem and title_elem.text.strip():
                     title = title_elem.text.strip()
                     break
@@ -319,10 +405,9 @@ class PodcastDownloadService(IPodcastDownloader):
             for script in scripts:
                 if script.string:
                     # Look for audio file URLs
-                    import re
-                    audio_matches = re.findall(r'https://[^\s"\']+\.mp3[^\s"\']*', script.string)
-                    if audio_matches:
-                        audio_url = audio_matches[0]
+                    audio_match = _MP3_SCRIPT_RE.search(script.string)
+                    if audio_match:
+                        audio_url = audio_match.group(0)
                         break
             
             if not audio_url:
@@ -352,6 +437,42 @@ class PodcastDownloadService(IPodcastDownloader):
             
         except Exception as e:
             raise Exception(f"XiaoYuZhou download failed: {str(e)}")
+    
+    def _render_xiaoyuzhou_page(self, url: str) -> str:
+        """Render a XiaoYuZhou page in headless Chrome and return its HTML"""
+        
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.common.exceptions import TimeoutException
+        
+        # Setup Chrome options
+        chrome_options = Options()
+        chrome_options.add_argument("--headless")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--window-size=1920,1080")
+        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+        
+        # Initialize driver
+        driver = None
+        try:
+            driver = webdriver.Chrome(options=chrome_options)
+            driver.get(url)
+            
+            # Wait until the JavaScript has rendered the audio source we need,
+            # rather than sleeping for a fixed period
+            try:
+                WebDriverWait(driver, 10).until(
+                    lambda d: '.mp3' in d.page_source
+                    or d.find_elements(By.CSS_SELECTOR, 'audio, source')
+                )
+            except TimeoutException:
+                pass  # Parse whatever has rendered so far
+            
+            return driver.page_source
         
         finally:
             if driver:
@@ -361,15 +482,29 @@ class PodcastDownloadService(IPodcastDownloader):
         """Download file from URL asynchronously"""
         
         import aiohttp
-        import asyncio
         
         headers = {
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         }
         
-        timeout = aiohttp.ClientTimeout(total=300)  # 5 minutes timeout
+        # No cap on the whole transfer (long episodes on slow links take a while);
+        # only a stalled connect or read fails the download
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=60)
         
         async with aiohttp.ClientSession(timeout=timeout, headers=headers) as session:
+            # Large files on CDNs that accept byte ranges are fetched over several
+            # connections, which helps when the CDN throttles each connection
+            # The ranges go to the URL the HEAD resolved, so tracker redirects are
+            # followed once and every range hits the same object
+            ranged = await self._get_ranged_content_length(session, url)
+            if ranged and ranged[1] >= PARALLEL_DOWNLOAD_MIN_BYTES and hasattr(os, 'pwrite'):
+                resolved_url, total_size = ranged
+                try:
+                    await self._download_ranges(session, resolved_url, output_path, total_size)
+                    return
+                except Exception as e:
+                    logger.warning(f"Parallel download failed, retrying with a single connection: {str(e)}")
+            
             async with session.get(url) as response:
                 response.raise_for_status()
                 
@@ -377,38 +512,105 @@ class PodcastDownloadService(IPodcastDownloader):
                     async for chunk in response.content.iter_chunked(8192):
                         f.write(chunk)
     
+    async def _get_ranged_content_length(self, session, url: str) -> Optional[tuple[str, int]]:
+        """Return the redirect-resolved URL and file size if the server advertises byte-range support"""
+        
+        try:
+            async with session.head(url, allow_redirects=True) as response:
+                if response.status != 200:
+                    return None
+                if response.headers.get('Accept-Ranges', '').lower() != 'bytes':
+                    return None
+                total_size = int(response.headers.get('Content-Length', 0))
+                if not total_size:
+                    return None
+                return str(response.url), total_size
+        except Exception:
+            return None
+    
+    async def _download_ranges(
+        self,
+        session,
+        url: str,
+        output_path: str,
+        total_size: int,
+        parallel_chunks: int = PARALLEL_DOWNLOAD_CHUNKS
+    ) -> None:
+        """Fetch byte ranges concurrently and write each at its offset in one preallocated file"""
+        
+        chunk_size = -(-total_size // parallel_chunks)
+        ranges = [
+            (start, min(start + chunk_size, total_size) - 1)
+            for start in range(0, total_size, chunk_size)
+        ]
+        
+        fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            if hasattr(os, 'posix_fallocate'):
+                os.posix_fallocate(fd, 0, total_size)
+            else:
+                os.ftruncate(fd, total_size)
+            
+            async def fetch_range(start: int, end: int) -> None:
+                async with session.get(url, headers={'Range': f'bytes={start}-{end}'}) as response:
+                    response.raise_for_status()
+                    if response.status != 206:
+                        raise FileProcessingError(f"Server ignored range request ({response.status})")
+                    
+                    # Chunks are gathered into larger buffers and written off the event loop
+                    offset = start
+                    buffered = []
+                    buffered_size = 0
+                    async for chunk in response.content.iter_chunked(64 * 1024):
+                        buffered.append(chunk)
+                        buffered_size += len(chunk)
+                        if buffered_size >= RANGE_WRITE_BUFFER_BYTES:
+                            await asyncio.to_thread(_pwrite_all, fd, b"".join(buffered), offset)
+                            offset += buffered_size
+                            buffered = []
+                            buffered_size = 0
+                    if buffered:
+                        await asyncio.to_thread(_pwrite_all, fd, b"".join(buffered), offset)
+                        offset += buffered_size
+                    
+                    if offset != end + 1:
+                        raise FileProcessingError(f"Incomplete range {start}-{end}: got {offset - start} bytes")
+            
+            tasks = [asyncio.ensure_future(fetch_range(start, end)) for start, end in ranges]
+            try:
+                await asyncio.gather(*tasks)
+            except BaseException:
+                # Stop the remaining writers before the descriptor is closed
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+        finally:
+            os.close(fd)
+    
     def _find_audio_url_in_html(self, html: str) -> Optional[str]:
         """Find audio URL in HTML content"""
         
-        # Find all .mp3 and .m4a URLs
-        audio_urls = re.findall(r'https://[^\s^"]+(?:\.mp3|\.m4a)', html)
+        # Only the last .mp3/.m4a URL on the page is used, so keep a single match
+        last_match = None
+        for match in _AUDIO_URL_RE.finditer(html):
+            last_match = match
         
-        if audio_urls:
-            pattern = r'=https?://[^\s^"]+(?:\.mp3|\.m4a)'
-            result = re.findall(pattern, audio_urls[-1])
-            if result:
-                return result[-1][1:]
-            else:
-                return audio_urls[-1]
+        if last_match is None:
+            return None
         
-        return None
+        audio_url = last_match.group(0)
+        if '=' in audio_url:
+            wrapped = _WRAPPED_AUDIO_URL_RE.search(audio_url)
+            if wrapped:
+                return wrapped.group(1)
+        return audio_url
     
-    def _extract_apple_title(self, soup: BeautifulSoup) -> Optional[str]:
+    def _extract_apple_title(self, soup: "BeautifulSoup") -> Optional[str]:
         """Extract title from Apple Podcast page"""
         
-        title_selectors = [
-            'span.product-header__title',
-            'h1.product-header__title',
-            '.product-header__title',
-            'h1[data-testid="product-header-title"]',
-            '.headings__title',
-            'h1.headings__title',
-            '.episode-title',
-            'h1'
-        ]
-        
-        for selector in title_selectors:
-            title_elem = soup.select_one(selector)
+        for selector in _compile_selectors(APPLE_TITLE_SELECTORS):
+            title_elem = selector.select_one(soup)
             if title_elem:
                 return title_elem.text.strip().replace('/', '-')
         
@@ -451,32 +653,19 @@ class PodcastDownloadService(IPodcastDownloader):
         self,
         episode_id: str,
         audio_url: str,
-        output_folder: str,
-        convert_to_mp3: bool
+        output_folder: str
     ) -> str:
         """Generate output filename"""
         
-        if convert_to_mp3:
+        # Extract extension from URL
+        parsed_url = urlparse(audio_url)
+        _, extension = os.path.splitext(parsed_url.path)
+        if not extension:
             extension = ".mp3"
-        else:
-            # Extract extension from URL
-            parsed_url = urlparse(audio_url)
-            _, extension = os.path.splitext(parsed_url.path)
-            if not extension:
-                extension = ".mp3"
         
         filename = f"{episode_id}_episode_audio{extension}"
         return os.path.join(output_folder, filename)
     
-    def _download_file(self, url: str, output_path: str) -> None:
-        """Download file from URL"""
-        
-        with requests.get(url, stream=True) as response:
-            response.raise_for_status()
-            with open(output_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-    
     async def _convert_to_mp3(
         self,
         input_file: str,
@@ -484,32 +673,48 @@ class PodcastDownloadService(IPodcastDownloader):
     ) -> str:
         """Convert audio file to MP3 format"""
         
-        base_name = os.path.splitext(input_file)[0]
-        output_file = f"{base_name}.mp3"
-        
-        if input_file == output_file:
+        base_name, extension = os.path.splitext(input_file)
+        if extension.lower() == ".mp3":
             return input_file  # Already MP3
         
+        output_file = f"{base_name}.mp3"
+        
         try:
+            format_name, codec_name = await self._probe_audio_format(input_file)
+            
+            # The bytes already form an MP3 file; only the name is wrong
+            if format_name == "mp3":
+                self._place_without_conversion(input_file, output_file, keep_original)
+                print(f"Source is already MP3, renamed to: {output_file}")
+                return output_file
+            
+            # MP3 audio in another container only needs a remux, not a transcode
+            if codec_name == "mp3":
+                codec_args = ['-c:a', 'copy']
+            else:
+                codec_args = ['-codec:a', 'libmp3lame', '-b:a', '128k']
+            
             cmd = [
                 'ffmpeg',
+                '-nostdin',
+                '-threads', '0',
                 '-i', input_file,
-                '-codec:a', 'libmp3lame',
-                '-b:a', '128k',
+                *codec_args,
                 '-y',
                 output_file
             ]
             
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None,
-                subprocess.run,
-                cmd,
-                True,  # capture_output
-                True   # text
-            )
+            # Await ffmpeg directly on the event loop instead of parking an
+            # executor thread for the whole transcode
+            async with _ffmpeg_semaphore():
+                process = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+                _, stderr = await process.communicate()
             
-            if result.returncode == 0:
+            if process.returncode == 0:
                 print(f"Successfully converted to: {output_file}")
                 
                 if not keep_original:
@@ -518,9 +723,59 @@ class PodcastDownloadService(IPodcastDownloader):
                 
                 return output_file
             else:
-                print(f"Error converting file: {result.stderr}")
+                print(f"Error converting file: {stderr.decode(errors='replace')}")
                 return input_file
                 
         except Exception as e:
             print(f"Error during conversion: {str(e)}")
-            return input_file 
\ No newline at end of file
+            return input_file
+    
+    def _place_without_conversion(self, input_file: str, output_file: str, keep_original: bool) -> None:
+        """Expose input_file at output_file without copying any bytes where possible"""
+        
+        if not keep_original:
+            try:
+                os.replace(input_file, output_file)
+            except OSError:
+                # Cross-filesystem move
+                _fast_copy(input_file, output_file)
+                os.remove(input_file)
+            return
+        
+        if os.path.exists(output_file):
+            os.remove(output_file)
+        try:
+            # Hardlink shares the data blocks, so keeping the original costs nothing
+            os.link(input_file, output_file)
+        except OSError:
+            _fast_copy(input_file, output_file)
+    
+    async def _probe_audio_format(self, input_file: str) -> tuple[Optional[str], Optional[str]]:
+        """Return (container format, first audio codec) reported by ffprobe"""
+        
+        cmd = [
+            'ffprobe',
+            '-v', 'error',
+            '-select_streams', 'a:0',
+            '-show_entries', 'format=format_name:stream=codec_name',
+            '-of', 'json',
+            input_file
+        ]
+        
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            stdout, _ = await process.communicate()
+            if process.returncode != 0:
+                return None, None
+            
+            probe = json.loads(stdout)
+            streams = probe.get("streams") or [{}]
+            return probe.get("format", {}).get("format_name"), streams[0].get("codec_name")
+            
+        except Exception as e:
+            print(f"Error probing audio format: {str(e)}")
+            return None, None
@@ -17,8 +17,9 @@ Usage in Modal Configuration:
 
 Usage in Distributed Transcription:
 - DistributedTranscriptionService.merge_chunk_results() calls speaker unification
-- Speaker embeddings are extracted for each speaker segment using inference.crop()
-- Cosine distance calculations determine if speakers are the same across chunks
+- Speaker embeddings are extracted in one batched model forward pass, each from up to
+  5 s of that speaker's longest turns
+- Cosine distances for all speaker pairs are computed in one matrix product (numba JIT when installed)
 - Speaker IDs are unified to prevent duplicate speaker labeling
 
 Example workflow:
@@ -33,22 +34,47 @@ Technical Details:
 - Uses pyannote/embedding model for feature extraction
 - Cosine distance threshold of 0.3 for speaker matching (configurable)
 - Supports both single-file and distributed transcription workflows
-- Thread-safe speaker database operations
-- Persistent storage in JSON format for speaker history
+- Concurrency-safe speaker database operations (lock-free similarity search)
+- Segment embeddings cached on disk, keyed by audio hash, segment bounds and model
+- Persistent storage as JSON metadata plus an .npz of 8-bit embedding codes
 """
 
 import asyncio
+import base64
+import bisect
+import hashlib
 import json
+import os
 import pickle
-import threading
 from datetime import datetime
+from itertools import accumulate
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Set
 from dataclasses import asdict
 
 import numpy as np
 import torch
-from scipy.spatial.distance import cosine
+
+# Optional JIT for the speaker unification inner loop
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Optional fast JSON codec for the speaker metadata file
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Optional approximate nearest-neighbor index for large speaker databases
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
 
 from ..interfaces.speaker_manager import (
     ISpeakerEmbeddingManager,
@@ -60,6 +86,170 @@ from ..utils.errors import SpeakerDiarizationError, ModelLoadError
 from ..utils.config import AudioProcessingConfig
 
 
+# Above this many (transcription x speaker) cells the broadcast overlap matrix
+# is replaced by a sorted sweep
+OVERLAP_MATRIX_MAX_CELLS = 1 << 22
+
+
+# Below this many chunk speakers a numpy matrix product beats JIT dispatch
+NUMBA_MIN_ROWS = 64
+
+# Below this many global speakers an exact matrix product beats building an HNSW graph
+FAISS_MIN_SPEAKERS = 256
+# HNSW candidates per query, re-ranked against the current embeddings
+FAISS_CANDIDATES = 8
+
+
+# Seconds of a speaker's longest turns pooled into one embedding
+MIN_AGGREGATE_SECONDS = 5.0
+
+
+def _aggregate_spans(spans: List[tuple], min_agg_sec: float = MIN_AGGREGATE_SECONDS) -> List[tuple]:
+    """Pick one speaker's longest non-overlapping (start, end) spans until they cover min_agg_sec, in time order"""
+    
+    chosen = []
+    total = 0.0
+    for start, end in sorted(spans, key=lambda span: span[1] - span[0], reverse=True):
+        if total >= min_agg_sec:
+            break
+        if end <= start or any(start < chosen_end and end > chosen_start for chosen_start, chosen_end in chosen):
+            continue
+        chosen.append((start, end))
+        total += end - start
+    
+    return sorted(chosen) or list(spans[:1])
+
+
+def _normalize(embedding: np.ndarray) -> np.ndarray:
+    """Flatten an embedding to a 1-D float32 vector of unit L2 norm, so cosine distance reduces to 1 - dot"""
+    vector = np.asarray(embedding, dtype=np.float32).reshape(-1)
+    return vector / max(float(np.linalg.norm(vector)), 1e-12)
+
+
+def _quantize_matrix(matrix: np.ndarray) -> tuple:
+    """Encode each row as uint8 codes with a per-row affine scale: x ~= alpha * q + shift"""
+    
+    matrix = np.asarray(matrix, dtype=np.float32)
+    low = matrix.min(axis=1)
+    alpha = (matrix.max(axis=1) - low) / 255.0
+    alpha[alpha == 0] = 1.0
+    codes = np.round((matrix - low[:, None]) / alpha[:, None]).clip(0, 255).astype(np.uint8)
+    return codes, alpha, low
+
+
+def _dequantize_embedding(speaker_data: Dict[str, Any]) -> np.ndarray:
+    """Decode an embedding stored inline in a legacy JSON speakers file"""
+    
+    if "embedding_q" not in speaker_data:
+        return np.array(speaker_data["embedding"], dtype=np.float32)
+    
+    codes = np.frombuffer(base64.b64decode(speaker_data["embedding_q"]), dtype=np.uint8)
+    return codes.astype(np.float32) * np.float32(speaker_data["alpha"]) + np.float32(speaker_data["shift"])
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _nearest_previous_numba(matrix):
+        rows, dims = matrix.shape
+        best_index = np.full(rows, -1, dtype=np.int64)
+        best_similarity = np.full(rows, -np.inf, dtype=np.float32)
+        for i in prange(1, rows):
+            row_best_index = -1
+            row_best_similarity = -np.inf
+            for j in range(i):
+                similarity = 0.0
+                for k in range(dims):
+                    similarity += matrix[i, k] * matrix[j, k]
+                if similarity > row_best_similarity:
+                    row_best_similarity = similarity
+                    row_best_index = j
+            best_index[i] = row_best_index
+            best_similarity[i] = row_best_similarity
+        return best_index, best_similarity
+
+
+def _nearest_previous(matrix: np.ndarray) -> tuple:
+    """
+    For each row of a normalized (M, D) matrix, the most similar earlier row
+    
+    Returns:
+        (index array, cosine similarity array); row 0 has index -1
+    """
+    if NUMBA_AVAILABLE and len(matrix) >= NUMBA_MIN_ROWS:
+        return _nearest_previous_numba(np.ascontiguousarray(matrix, dtype=np.float32))
+    
+    similarities = matrix @ matrix.T
+    similarities[np.triu_indices(len(matrix))] = -np.inf
+    best_index = similarities.argmax(axis=1)
+    best_similarity = similarities[np.arange(len(matrix)), best_index]
+    best_index[0] = -1
+    return best_index, best_similarity
+
+
+class EmbeddingCache:
+    """
+    On-disk cache of segment embeddings keyed by (audio hash, segment, model)
+    
+    Re-running unification on the same audio becomes a handful of np.load calls
+    instead of a model forward pass. The model ID is part of the key, so switching
+    embedding models never returns stale vectors.
+    """
+    
+    # Only the head and tail of the file are hashed, together with its size; the
+    # head alone can be identical across episodes sharing ID3 tags and cover art
+    HASH_BYTES = 1 << 20
+    TAIL_HASH_BYTES = 64 * 1024
+    
+    def __init__(
+        self,
+        cache_dir: str = "~/.cache/speaker_embeddings",
+        model_id: str = "pyannote/embedding"
+    ):
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.model_id = model_id.replace("/", "-")
+    
+    def audio_key(self, audio_path: str) -> Optional[str]:
+        """Hash the audio file size, head and tail, or None if it cannot be read"""
+        
+        try:
+            with open(audio_path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                digest = hashlib.sha1(str(size).encode())
+                digest.update(f.read(self.HASH_BYTES))
+                if size > self.HASH_BYTES:
+                    f.seek(max(self.HASH_BYTES, size - self.TAIL_HASH_BYTES))
+                    digest.update(f.read())
+                return digest.hexdigest()[:16]
+        except OSError:
+            return None
+    
+    def _entry_path(self, audio_key: str, spans: List[tuple]) -> Path:
+        segment_key = "_".join(f"{round(start, 2)}-{round(end, 2)}" for start, end in spans)
+        if len(segment_key) > 64:
+            segment_key = hashlib.sha1(segment_key.encode()).hexdigest()[:16]
+        return self.cache_dir / f"{audio_key}_{segment_key}_{self.model_id}.npy"
+    
+    def get(self, audio_key: str, spans: List[tuple]) -> Optional[np.ndarray]:
+        """Return the cached embedding for a group of (start, end) spans, or None on a miss"""
+        
+        try:
+            return np.load(self._entry_path(audio_key, spans)).astype(np.float32)
+        except (OSError, ValueError):
+            return None
+    
+    def put(self, audio_key: str, spans: List[tuple], embedding: np.ndarray) -> None:
+        """Store a normalized embedding as float16"""
+        
+        path = self._entry_path(audio_key, spans)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_suffix(".tmp.npy")
+            np.save(temp_path, np.asarray(embedding, dtype=np.float16))
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"⚠️ Failed to cache speaker embedding: {e}")
+
+
 class SpeakerEmbeddingService(ISpeakerEmbeddingManager):
     """Global speaker embedding management service"""
     
@@ -69,12 +259,28 @@ class SpeakerEmbeddingService(ISpeakerEmbeddingManager):
         similarity_threshold: float = 0.3
     ):
         self.storage_path = Path(storage_path)
+        self.embeddings_path = self.storage_path.with_suffix('.npz')
         self.similarity_threshold = similarity_threshold
         self.speakers: Dict[str, SpeakerEmbedding] = {}
         self.speaker_counter = 0
-        self.lock = threading.Lock()
+        self.lock = asyncio.Lock()
         self._loaded = False
         
+        # Search index over self.speakers: L2-normalized float32 rows aligned
+        # with self._ids, rebuilt lazily after any mutation. A rebuild creates a
+        # new array, so a matrix handed to a reader is an immutable snapshot;
+        # _matrix_version is bumped on every mutation to detect stale searches
+        self._matrix: Optional[np.ndarray] = None
+        self._ids: List[str] = []
+        self._matrix_dirty = True
+        self._matrix_version = 0
+        
+        # HNSW index (faiss) over the same rows for large databases. Inserts are
+        # appended; in-place updates only drift a vector slightly, so candidates
+        # are re-ranked on current embeddings instead of rebuilding the graph
+        self._index = None
+        self._index_ids: List[str] = []
+        
         # Don't load speakers in __init__ to avoid async issues
         # Loading will happen on first use via _ensure_loaded()
     
@@ -92,21 +298,10 @@ class SpeakerEmbeddingService(ISpeakerEmbeddingManager):
         
         try:
             loop = asyncio.get_event_loop()
-            data = await loop.run_in_executor(None, self._read_speakers_file)
-            
-            self.speakers = {
-                speaker_id: SpeakerEmbedding(
-                    speaker_id=speaker_data["speaker_id"],
-                    embedding=np.array(speaker_data["embedding"]),
-                    confidence=speaker_data["confidence"],
-                    source_files=speaker_data["source_files"],
-                    sample_count=speaker_data["sample_count"],
-                    created_at=speaker_data["created_at"],
-                    updated_at=speaker_data["updated_at"]
-                )
-                for speaker_id, speaker_data in data.get("speakers", {}).items()
-            }
-            self.speaker_counter = data.get("speaker_counter", 0)
+            self.speakers, self.speaker_counter = await loop.run_in_executor(None, self._read_speakers_file)
+            self._matrix_dirty = True
+            self._matrix_version += 1
+            self._index = None
             
             print(f"✅ Loaded {len(self.speakers)} known speakers")
             
@@ -114,16 +309,19 @@ class SpeakerEmbeddingService(ISpeakerEmbeddingManager):
             print(f"⚠️ Failed to load speaker data: {e}")
             self.speakers = {}
             self.speaker_counter = 0
+            self._matrix_dirty = True
+            self._matrix_version += 1
+            self._index = None
     
     async def save_speakers(self) -> None:
         """Save speaker data to storage file"""
         
         try:
             data = {
+                "embeddings_file": self.embeddings_path.name,
                 "speakers": {
                     speaker_id: {
                         "speaker_id": speaker.speaker_id,
-                        "embedding": speaker.embedding.tolist(),
                         "confidence": speaker.confidence,
                         "source_files": speaker.source_files,
                         "sample_count": speaker.sample_count,
@@ -136,8 +334,10 @@ class SpeakerEmbeddingService(ISpeakerEmbeddingManager):
                 "updated_at": datetime.now().isoformat()
             }
             
+            ids = list(self.speakers.keys())
+            
             loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, self._write_speakers_file, data)
+            await loop.run_in_executor(None, self._write_speakers_file, data, ids)
             
             print(f"💾 Speaker data saved: {len(self.speakers)} speakers")
             
@@ -147,28 +347,24 @@ class SpeakerEmbeddingService(ISpeakerEmbeddingManager):
     async def find_matching_speaker(
         self,
         embedding: np.ndarray,
-        source_file: str
+        source_file: str,
+        forbid_merge_set: Optional[Set[str]] = None
     ) -> Optional[str]:
-        """Find matching speaker from existing embeddings"""
+        """Find matching speaker from existing embeddings, never returning an ID in forbid_merge_set"""
         
         await self._ensure_loaded()
         
         if not self.speakers:
             return None
         
-        best_match_id = None
-        best_similarity = float('inf')
+        query = _normalize(embedding).reshape(1, -1)
+        best_ids, distances = self._best_matches(query, forbid_merge_set or set())
         
-        for speaker_id, speaker in self.speakers.items():
-            # Calculate cosine distance
-            distance = cosine(embedding, speaker.embedding)
-            
-            if distance < best_similarity:
-                best_similarity = distance
-                best_match_id = speaker_id
+        best_match_id = best_ids[0]
+        best_similarity = float(distances[0])  # cosine distance
         
         # Check if similarity threshold is met
-        if best_similarity <= self.similarity_threshold:
+        if best_match_id is not None and best_similarity <= self.similarity_threshold:
             print(f"🎯 Found matching speaker: {best_match_id} (distance: {best_similarity:.3f})")
             return best_match_id
         
@@ -180,53 +376,94 @@ class SpeakerEmbeddingService(ISpeakerEmbeddingManager):
         embedding: np.ndarray,
         source_file: str,
         confidence: float = 1.0,
-        original_label: Optional[str] = None
+        original_label: Optional[str] = None,
+        now_iso: Optional[str] = None,
+        forbid_merge_set: Optional[Set[str]] = None
     ) -> str:
         """Add new speaker or update existing speaker"""
         
         await self._ensure_loaded()
         
-        with self.lock:
-            # Find matching speaker
-            matching_speaker_id = await self.find_matching_speaker(embedding, source_file)
-            
-            if matching_speaker_id:
-                # Update existing speaker
-                speaker = self.speakers[matching_speaker_id]
-                
-                # Update embedding vector using weighted average
-                weight = 1.0 / (speaker.sample_count + 1)
-                speaker.embedding = (speaker.embedding * (1 - weight) + embedding * weight)
-                
-                # Update other information
-                if source_file not in speaker.source_files:
-                    speaker.source_files.append(source_file)
-                speaker.sample_count += 1
-                speaker.confidence = max(speaker.confidence, confidence)
-                speaker.updated_at = datetime.now().isoformat()
-                
-                print(f"🔄 Updated speaker {matching_speaker_id}: {speaker.sample_count} samples")
-                return matching_speaker_id
+        now_iso = now_iso or datetime.now().isoformat()
+        
+        # Stored embeddings are kept unit-norm
+        embedding = _normalize(embedding)
+        
+        while True:
+            # Similarity search is a pure read over the current matrix snapshot,
+            # so it runs outside the lock
+            version = self._matrix_version
+            matching_speaker_id = await self.find_matching_speaker(embedding, source_file, forbid_merge_set)
             
-            else:
-                # Create new speaker
-                self.speaker_counter += 1
-                new_speaker_id = f"SPEAKER_GLOBAL_{self.speaker_counter:03d}"
-                
-                new_speaker = SpeakerEmbedding(
-                    speaker_id=new_speaker_id,
-                    embedding=embedding.copy(),
-                    confidence=confidence,
-                    source_files=[source_file],
-                    sample_count=1,
-                    created_at=datetime.now().isoformat(),
-                    updated_at=datetime.now().isoformat()
-                )
-                
-                self.speakers[new_speaker_id] = new_speaker
+            async with self.lock:
+                if self._matrix_version != version:
+                    # Speakers changed while searching; match again
+                    continue
                 
-                print(f"🆕 Created new speaker {new_speaker_id}")
-                return new_speaker_id
+                if matching_speaker_id:
+                    return self._update_speaker(matching_speaker_id, embedding, source_file, confidence, now_iso)
+                return self._create_speaker(embedding, source_file, confidence, now_iso)
+    
+    def _update_speaker(
+        self,
+        speaker_id: str,
+        embedding: np.ndarray,
+        source_file: str,
+        confidence: float,
+        now_iso: str
+    ) -> str:
+        """Fold a normalized embedding into an existing speaker (caller holds self.lock)"""
+        
+        speaker = self.speakers[speaker_id]
+        
+        # Update embedding vector using weighted average
+        weight = 1.0 / (speaker.sample_count + 1)
+        speaker.embedding = _normalize(speaker.embedding * (1 - weight) + embedding * weight)
+        
+        # Update other information
+        if source_file not in speaker.source_files:
+            speaker.source_files.append(source_file)
+        speaker.sample_count += 1
+        speaker.confidence = max(speaker.confidence, confidence)
+        speaker.updated_at = now_iso
+        self._matrix_dirty = True
+        self._matrix_version += 1
+        
+        print(f"🔄 Updated speaker {speaker_id}: {speaker.sample_count} samples")
+        return speaker_id
+    
+    def _create_speaker(
+        self,
+        embedding: np.ndarray,
+        source_file: str,
+        confidence: float,
+        now_iso: str
+    ) -> str:
+        """Register a new speaker for a normalized embedding (caller holds self.lock)"""
+        
+        self.speaker_counter += 1
+        new_speaker_id = f"SPEAKER_GLOBAL_{self.speaker_counter:03d}"
+        
+        new_speaker = SpeakerEmbedding(
+            speaker_id=new_speaker_id,
+            embedding=embedding,
+            confidence=confidence,
+            source_files=[source_file],
+            sample_count=1,
+            created_at=now_iso,
+            updated_at=now_iso
+        )
+        
+        self.speakers[new_speaker_id] = new_speaker
+        self._matrix_dirty = True
+        self._matrix_version += 1
+        
+        if self._index is not None:
+            self._index.add(np.ascontiguousarray(embedding.reshape(1, -1), dtype=np.float32))
+            self._index_ids.append(new_speaker_id)
+        
+        print(f"🆕 Created new speaker {new_speaker_id}")
+        return new_speaker_id
     
     async def map_local_to_global_speakers(
         self,
@@ -235,15 +472,33 @@ class SpeakerEmbeddingService(ISpeakerEmbeddingManager):
     ) -> Dict[str, str]:
         """Map local speaker labels to global speaker IDs"""
         
+        await self._ensure_loaded()
+        
+        # One timestamp for every speaker touched by this chunk
+        now_iso = datetime.now().isoformat()
         mapping = {}
         
-        for local_label, embedding in local_embeddings.items():
-            global_id = await self.add_or_update_speaker(
-                embedding=embedding,
-                source_file=source_file,
-                original_label=local_label
-            )
-            mapping[local_label] = global_id
+        if local_embeddings:
+            # Score all local speakers against the global database in one matrix product.
+            # Diarization already separated the local labels, so two labels of one
+            # source are never merged into the same global speaker
+            local_labels = list(local_embeddings.keys())
+            queries = np.stack([_normalize(embedding) for embedding in local_embeddings.values()])
+            
+            version = self._matrix_version
+            matches = self._match_batch(queries, set())
+            
+            async with self.lock:
+                if self._matrix_version != version:
+                    matches = self._match_batch(queries, set())
+                
+                for local_label, query, matching_speaker_id in zip(local_labels, queries, matches):
+                    if matching_speaker_id:
+                        mapping[local_label] = self._update_speaker(
+                            matching_speaker_id, query, source_file, 1.0, now_iso
+                        )
+                    else:
+                        mapping[local_label] = self._create_speaker(query, source_file, 1.0, now_iso)
         
         # Save updated speaker data
         await self.save_speakers()
@@ -272,18 +527,180 @@ class SpeakerEmbeddingService(ISpeakerEmbeddingManager):
             }
         }
     
-    def _read_speakers_file(self) -> Dict[str, Any]:
-        """Read speakers file synchronously"""
-        with open(self.storage_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+    def _match_batch(
+        self,
+        queries: np.ndarray,
+        forbid_merge_set: Optional[Set[str]] = None
+    ) -> List[Optional[str]]:
+        """
+        Best matching speaker ID (or None) for each row of a normalized (K, D) query matrix
+        
+        With a forbid_merge_set, IDs in it are never returned and every match is
+        added to it, so no two rows resolve to the same speaker.
+        """
+        if not self.speakers:
+            return [None] * len(queries)
+        
+        forbidden = forbid_merge_set if forbid_merge_set is not None else set()
+        best_ids, distances = self._best_matches(queries, forbidden)
+        
+        matches = []
+        for row, (speaker_id, distance) in enumerate(zip(best_ids, distances.tolist())):
+            if speaker_id is not None and speaker_id in forbidden:
+                # Claimed by an earlier row of this batch; rescore against the rest
+                row_ids, row_distances = self._best_matches(queries[row:row + 1], forbidden)
+                speaker_id, distance = row_ids[0], float(row_distances[0])
+            
+            match = speaker_id if speaker_id is not None and distance <= self.similarity_threshold else None
+            if match and forbid_merge_set is not None:
+                forbid_merge_set.add(match)
+            matches.append(match)
+        
+        return matches
+    
+    def _best_matches(self, queries: np.ndarray, forbidden: Set[str]) -> tuple:
+        """
+        (closest speaker IDs, cosine distances) for each row of a normalized (K, D) query matrix
+        
+        Speakers in forbidden are skipped; a row with no remaining candidate gets
+        (None, inf).
+        """
+        index = self._get_search_index()
+        if index is not None:
+            _, candidates = index.search(
+                np.ascontiguousarray(queries, dtype=np.float32),
+                FAISS_CANDIDATES + len(forbidden)
+            )
+            
+            best_ids = []
+            distances = []
+            for query, row in zip(queries, candidates):
+                row_ids = [
+                    self._index_ids[candidate] for candidate in row
+                    if candidate >= 0 and self._index_ids[candidate] not in forbidden
+                ]
+                if not row_ids:
+                    best_ids.append(None)
+                    distances.append(np.inf)
+                    continue
+                similarities = np.stack([
+                    self.speakers[speaker_id].embedding for speaker_id in row_ids
+                ]) @ query
+                best = int(similarities.argmax())
+                best_ids.append(row_ids[best])
+                distances.append(1.0 - float(similarities[best]))
+            
+            return best_ids, np.array(distances)
+        
+        # One matrix product scores every known speaker at once
+        matrix, speaker_ids = self._get_search_matrix()
+        similarities = queries @ matrix.T
+        if forbidden:
+            similarities[:, [column for column, speaker_id in enumerate(speaker_ids) if speaker_id in forbidden]] = -np.inf
+        best = similarities.argmax(axis=1)
+        distances = 1.0 - similarities[np.arange(len(queries)), best]
+        
+        return [
+            speaker_ids[index] if np.isfinite(distance) else None
+            for index, distance in zip(best.tolist(), distances.tolist())
+        ], distances
+    
+    def _get_search_index(self):
+        """Return the faiss HNSW index, building it on first use, or None for small databases"""
+        
+        if not FAISS_AVAILABLE or len(self.speakers) < FAISS_MIN_SPEAKERS:
+            return None
+        
+        if self._index is None:
+            matrix, speaker_ids = self._get_search_matrix()
+            index = faiss.IndexHNSWFlat(matrix.shape[1], 32, faiss.METRIC_INNER_PRODUCT)
+            index.add(np.ascontiguousarray(matrix, dtype=np.float32))
+            self._index = index
+            self._index_ids = list(speaker_ids)
+        
+        return self._index
+    
+    def _get_search_matrix(self) -> tuple:
+        """Return (normalized embedding matrix, aligned speaker IDs), rebuilding if stale"""
+        
+        if self._matrix_dirty:
+            self._ids = list(self.speakers.keys())
+            if self._ids:
+                # Rows are already flat and unit-norm (normalized on insertion/update/load)
+                self._matrix = np.stack([
+                    self.speakers[speaker_id].embedding
+                    for speaker_id in self._ids
+                ])
+            else:
+                self._matrix = None
+            self._matrix_dirty = False
+        
+        return self._matrix, self._ids
+    
+    def _read_speakers_file(self) -> tuple:
+        """Read speakers file synchronously: ({speaker_id: SpeakerEmbedding}, speaker_counter)"""
+        # Embeddings live in the .npz, so the JSON is small metadata parsed in one pass
+        if ORJSON_AVAILABLE:
+            header = orjson.loads(self.storage_path.read_bytes())
+        else:
+            with open(self.storage_path, 'r', encoding='utf-8') as f:
+                header = json.load(f)
+        speakers = self._build_speakers(header, header.get("speakers", {}).items())
+        
+        return speakers, int(header.get("speaker_counter", 0))
+    
+    def _build_speakers(self, header: Dict[str, Any], items) -> Dict[str, SpeakerEmbedding]:
+        """Construct SpeakerEmbedding objects from (speaker_id, metadata) pairs"""
+        
+        embeddings = {}
+        if "embeddings_file" in header:
+            with np.load(self.storage_path.with_name(header["embeddings_file"])) as arrays:
+                matrix = arrays["codes"].astype(np.float32) * arrays["alpha"][:, None] + arrays["shift"][:, None]
+                embeddings = dict(zip(arrays["ids"].tolist(), matrix))
+        
+        return {
+            speaker_id: SpeakerEmbedding(
+                speaker_id=speaker_data["speaker_id"],
+                embedding=_normalize(
+                    embeddings[speaker_id] if speaker_id in embeddings
+                    else _dequantize_embedding(speaker_data)
+                ),
+                confidence=speaker_data["confidence"],
+                source_files=speaker_data["source_files"],
+                sample_count=speaker_data["sample_count"],
+                created_at=speaker_data["created_at"],
+                updated_at=speaker_data["updated_at"]
+            )
+            for speaker_id, speaker_data in items
+        }
     
-    def _write_speakers_file(self, data: Dict[str, Any]) -> None:
+    def _write_speakers_file(self, data: Dict[str, Any], ids: List[str]) -> None:
         """Write speakers file synchronously"""
-        # Atomic write
-        temp_path = self.storage_path.with_suffix('.tmp')
-        with open(temp_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        temp_path.replace(self.storage_path)
+        # Embeddings go to the .npz as 8-bit codes (the in-memory float vectors
+        # keep full precision for running averages); the JSON holds metadata only
+        if ids:
+            codes, alpha, shift = _quantize_matrix(
+                np.stack([self.speakers[speaker_id].embedding for speaker_id in ids])
+            )
+        else:
+            codes, alpha, shift = np.zeros((0, 0), np.uint8), np.zeros(0, np.float32), np.zeros(0, np.float32)
+        
+        # Write both files in full before replacing either, then swap the .npz in
+        # first: speakers are never removed, so an interrupted save leaves the old
+        # JSON naming a subset of the new .npz ids, never ids it lacks
+        npz_temp_path = self.embeddings_path.with_suffix('.npz.tmp')
+        with open(npz_temp_path, 'wb') as f:
+            np.savez_compressed(f, ids=np.array(ids, dtype=str), codes=codes, alpha=alpha, shift=shift)
+        
+        json_temp_path = self.storage_path.with_suffix('.tmp')
+        if ORJSON_AVAILABLE:
+            json_temp_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(json_temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+        
+        os.replace(npz_temp_path, self.embeddings_path)
+        os.replace(json_temp_path, self.storage_path)
 
 
 class SpeakerIdentificationService(ISpeakerIdentificationService):
@@ -292,16 +709,21 @@ class SpeakerIdentificationService(ISpeakerIdentificationService):
     def __init__(
         self,
         embedding_manager: ISpeakerEmbeddingManager,
-        config: Optional[AudioProcessingConfig] = None
+        config: Optional[AudioProcessingConfig] = None,
+        embedding_cache: Optional[EmbeddingCache] = None
     ):
         self.embedding_manager = embedding_manager
         self.config = config or AudioProcessingConfig()
         self.auth_token = None
         self.pipeline = None
         self.embedding_model = None
+        # Half precision on CUDA (set in _load_models); float32 elsewhere
+        self.embedding_dtype = torch.float32
+        self.embedding_cache = embedding_cache or EmbeddingCache(
+            model_id=self.config.speaker_embedding_model
+        )
         
         # Check for HF token
-        import os
         self.auth_token = os.environ.get(self.config.hf_token_env_var)
         self.available = self.auth_token is not None
         
@@ -323,35 +745,22 @@ class SpeakerIdentificationService(ISpeakerIdentificationService):
             if self.embedding_model is None:
                 await self._load_models()
             
-            # Create inference object for embedding extraction
-            from pyannote.audio.core.inference import Inference
-            from pyannote.core import Segment
-            import torchaudio
+            # Longest turns of each speaker pooled into one clip, all speakers in a single batch
+            speaker_spans = {}
+            for segment in segments:
+                speaker_spans.setdefault(segment.speaker_id, []).append((segment.start, segment.end))
             
-            inference = Inference(self.embedding_model, window="whole")
+            if not speaker_spans:
+                return {}
             
-            # Load audio file
-            waveform, sample_rate = torchaudio.load(audio_path)
+            batch_embeddings = await self._embed_spans(
+                audio_path, [_aggregate_spans(spans) for spans in speaker_spans.values()]
+            )
             
             embeddings = {}
-            
-            # Extract embeddings for each unique speaker
-            for segment in segments:
-                if segment.speaker_id not in embeddings:
-                    # Create audio segment for embedding extraction
-                    audio_segment = Segment(segment.start, segment.end)
-                    
-                    # Extract embedding using inference.crop
-                    embedding = inference.crop(waveform, audio_segment)
-                    
-                    # Convert to numpy array and store
-                    if isinstance(embedding, torch.Tensor):
-                        embedding_np = embedding.detach().cpu().numpy()
-                    else:
-                        embedding_np = embedding
-                    
-                    embeddings[segment.speaker_id] = embedding_np
-                    print(f"🎯 Extracted embedding for {segment.speaker_id}: shape {embedding_np.shape}")
+            for speaker_id, embedding_np in zip(speaker_spans, batch_embeddings):
+                embeddings[speaker_id] = _normalize(embedding_np)
+                print(f"🎯 Extracted embedding for {speaker_id}: shape {embedding_np.shape}")
             
             return embeddings
             
@@ -406,32 +815,92 @@ class SpeakerIdentificationService(ISpeakerIdentificationService):
     ) -> List[Dict[str, Any]]:
         """Map transcription segments to speaker information"""
         
+        if not transcription_segments:
+            return []
+        
+        best_speakers = [None] * len(transcription_segments)
+        if speaker_segments:
+            if len(transcription_segments) * len(speaker_segments) <= OVERLAP_MATRIX_MAX_CELLS:
+                best_speakers = self._best_speakers_by_matrix(transcription_segments, speaker_segments)
+            else:
+                best_speakers = self._best_speakers_by_sweep(transcription_segments, speaker_segments)
+        
+        # Add speaker information to transcription segments
         result_segments = []
+        for trans_seg, speaker_id in zip(transcription_segments, best_speakers):
+            result_segment = trans_seg.copy()
+            result_segment["speaker"] = speaker_id
+            result_segments.append(result_segment)
+        
+        return result_segments
+    
+    @staticmethod
+    def _best_speakers_by_matrix(
+        transcription_segments: List[Dict[str, Any]],
+        speaker_segments: List[SpeakerSegment]
+    ) -> List[Optional[str]]:
+        """Largest-overlap speaker per transcription segment via a (T, S) overlap matrix"""
+        
+        trans_starts = np.fromiter((seg["start"] for seg in transcription_segments), dtype=np.float64)
+        trans_ends = np.fromiter((seg["end"] for seg in transcription_segments), dtype=np.float64)
+        speaker_starts = np.fromiter((seg.start for seg in speaker_segments), dtype=np.float64)
+        speaker_ends = np.fromiter((seg.end for seg in speaker_segments), dtype=np.float64)
         
+        # argmax keeps the first speaker segment on ties
+        overlaps = np.clip(
+            np.minimum(trans_ends[:, None], speaker_ends[None, :])
+            - np.maximum(trans_starts[:, None], speaker_starts[None, :]),
+            0, None
+        )
+        best = overlaps.argmax(axis=1)
+        valid = overlaps[np.arange(len(best)), best] > 0
+        
+        return [
+            speaker_segments[index].speaker_id if is_valid else None
+            for index, is_valid in zip(best.tolist(), valid.tolist())
+        ]
+    
+    @staticmethod
+    def _best_speakers_by_sweep(
+        transcription_segments: List[Dict[str, Any]],
+        speaker_segments: List[SpeakerSegment]
+    ) -> List[Optional[str]]:
+        """
+        Largest-overlap speaker per transcription segment via binary search
+        
+        Speaker segments are sorted by start; a running max of their ends lets the
+        backward scan stop as soon as no earlier segment can reach the query, so
+        each lookup costs O(log S + k) for k candidate segments.
+        """
+        order = sorted(range(len(speaker_segments)), key=lambda index: speaker_segments[index].start)
+        starts = [speaker_segments[index].start for index in order]
+        ends = [speaker_segments[index].end for index in order]
+        max_ends = list(accumulate(ends, max))
+        
+        best_speakers = []
         for trans_seg in transcription_segments:
             trans_start = trans_seg["start"]
             trans_end = trans_seg["end"]
             
-            # Find overlapping speaker segment
-            best_speaker = None
             best_overlap = 0
+            best_index = None
             
-            for speaker_seg in speaker_segments:
-                # Calculate overlap
-                overlap_start = max(trans_start, speaker_seg.start)
-                overlap_end = min(trans_end, speaker_seg.end)
-                overlap = max(0, overlap_end - overlap_start)
-                
-                if overlap > best_overlap:
+            j = bisect.bisect_left(starts, trans_end) - 1
+            while j >= 0 and max_ends[j] > trans_start:
+                overlap = min(trans_end, ends[j]) - max(trans_start, starts[j])
+                # Ties go to the earliest segment in the caller's order
+                if overlap > best_overlap or (
+                    overlap == best_overlap and best_index is not None and order[j] < best_index
+                ):
                     best_overlap = overlap
-                    best_speaker = speaker_seg.speaker_id
+                    best_index = order[j]
+                j -= 1
             
-            # Add speaker information to transcription segment
-            result_segment = trans_seg.copy()
-            result_segment["speaker"] = best_speaker
-            result_segments.append(result_segment)
+            best_speakers.append(
+                speaker_segments[best_index].speaker_id if best_index is not None else None
+            )
         
-        return result_segments
+        return best_speakers
     
     async def unify_distributed_speakers(
         self,
@@ -457,14 +926,6 @@ class SpeakerIdentificationService(ISpeakerIdentificationService):
             if self.embedding_model is None:
                 await self._load_models()
             
-            from pyannote.audio.core.inference import Inference
-            from pyannote.core import Segment
-            import torchaudio
-            from scipy.spatial.distance import cosine
-            
-            inference = Inference(self.embedding_model, window="whole")
-            waveform, sample_rate = torchaudio.load(audio_file_path)
-            
             # Collect all speaker segments from chunks with their chunk context
             all_speaker_segments = []
             
@@ -492,57 +953,46 @@ class SpeakerIdentificationService(ISpeakerIdentificationService):
             if not all_speaker_segments:
                 return {}
             
-            # Extract embeddings for each unique chunk speaker
+            # Extract embeddings for each unique chunk speaker in one batched forward pass
             speaker_embeddings = {}
             
+            # Each chunk speaker is embedded from its longest turns pooled into one clip
+            chunk_speaker_spans = {}
             for seg in all_speaker_segments:
-                chunk_speaker_id = seg["chunk_speaker_id"]
-                
-                if chunk_speaker_id not in speaker_embeddings:
-                    try:
-                        # Create audio segment for embedding extraction
-                        audio_segment = Segment(seg["start"], seg["end"])
-                        
-                        # Extract embedding using inference.crop
-                        embedding = inference.crop(waveform, audio_segment)
-                        
-                        # Convert to numpy array
-                        if hasattr(embedding, 'detach'):
-                            embedding_np = embedding.detach().cpu().numpy()
-                        else:
-                            embedding_np = embedding
-                            
-                        speaker_embeddings[chunk_speaker_id] = embedding_np
-                        print(f"🎯 Extracted embedding for {chunk_speaker_id}: shape {embedding_np.shape}")
-                        
-                    except Exception as e:
-                        print(f"⚠️ Failed to extract embedding for {chunk_speaker_id}: {e}")
-                        continue
+                chunk_speaker_spans.setdefault(seg["chunk_speaker_id"], []).append((seg["start"], seg["end"]))
+            
+            try:
+                batch_embeddings = await self._embed_spans(
+                    audio_file_path, [_aggregate_spans(spans) for spans in chunk_speaker_spans.values()]
+                )
+                for chunk_speaker_id, embedding_np in zip(chunk_speaker_spans, batch_embeddings):
+                    speaker_embeddings[chunk_speaker_id] = _normalize(embedding_np)
+                    print(f"🎯 Extracted embedding for {chunk_speaker_id}: shape {embedding_np.shape}")
+            except Exception as e:
+                print(f"⚠️ Failed to extract speaker embeddings: {e}")
             
             # Perform speaker clustering based on embedding similarity
             unified_mapping = {}
             global_speaker_counter = 1
             similarity_threshold = 0.3  # Cosine distance threshold
             
-            for chunk_speaker_id, embedding in speaker_embeddings.items():
+            # Nearest earlier chunk speaker for every chunk speaker, in one pass
+            chunk_speaker_ids = list(speaker_embeddings.keys())
+            if chunk_speaker_ids:
+                matrix = np.stack([
+                    speaker_embeddings[chunk_speaker_id]
+                    for chunk_speaker_id in chunk_speaker_ids
+                ])
+                nearest_index, nearest_similarity = _nearest_previous(matrix)
+            
+            # Greedy pass: each speaker joins its closest already-assigned speaker
+            for index, chunk_speaker_id in enumerate(chunk_speaker_ids):
                 best_match_id = None
                 best_distance = float('inf')
                 
-                # Compare with existing unified speakers
-                for existing_id, mapped_global_id in unified_mapping.items():
-                    if existing_id != chunk_speaker_id and existing_id in speaker_embeddings:
-                        existing_embedding = speaker_embeddings[existing_id]
-                        
-                        try:
-                            # Calculate cosine distance
-                            distance = cosine(embedding.flatten(), existing_embedding.flatten())
-                            
-                            if distance < best_distance:
-                                best_distance = distance
-                                best_match_id = mapped_global_id
-                        except Exception as e:
-                            print(f"⚠️ Error calculating distance: {e}")
-                            continue
+                if index > 0:
+                    best_distance = 1.0 - float(nearest_similarity[index])
+                    best_match_id = unified_mapping[chunk_speaker_ids[int(nearest_index[index])]]
                 
                 # Assign speaker ID based on similarity
                 if best_match_id and best_distance <= similarity_threshold:
@@ -573,6 +1023,102 @@ class SpeakerIdentificationService(ISpeakerIdentificationService):
             print(f"❌ Speaker unification failed: {e}")
             return {}
     
+    async def _embed_spans(self, audio_path: str, span_groups: List[List[tuple]]) -> List[np.ndarray]:
+        """
+        Normalized embeddings for groups of (start, end) spans of an audio file
+        
+        Each group is concatenated into one clip and yields one embedding. Cached
+        groups are read from the embedding cache; only the misses load the audio
+        and go through the model, and their results are written back.
+        """
+        cache = self.embedding_cache
+        audio_key = await asyncio.to_thread(cache.audio_key, audio_path)
+        
+        if audio_key is None:
+            embeddings = [None] * len(span_groups)
+        else:
+            embeddings = await asyncio.to_thread(
+                lambda: [cache.get(audio_key, spans) for spans in span_groups]
+            )
+        
+        missing = [index for index, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            import torchaudio
+            
+            waveform, sample_rate = await asyncio.to_thread(torchaudio.load, audio_path)
+            computed = self._embed_segments(waveform, sample_rate, [span_groups[index] for index in missing])
+            
+            for index, embedding in zip(missing, computed):
+                embeddings[index] = _normalize(embedding)
+            
+            if audio_key is not None:
+                await asyncio.to_thread(
+                    lambda: [cache.put(audio_key, span_groups[index], embeddings[index]) for index in missing]
+                )
+        
+        return embeddings
+    
+    def _embed_segments(
+        self,
+        waveform: torch.Tensor,
+        sample_rate: int,
+        span_groups: List[List[tuple]]
+    ) -> np.ndarray:
+        """
+        Embed several groups of (start, end) spans of one waveform in a single forward pass
+        
+        The spans of a group are concatenated into one clip. Clips are zero-padded
+        to a common length and a weight mask keeps the padding out of the model's
+        statistics pooling.
+        
+        Returns:
+            Array of shape (len(span_groups), embedding_dim)
+        """
+        device = getattr(self.embedding_model, "device", torch.device("cpu"))
+        
+        # Downmix to mono (channel, samples)
+        if waveform.dim() == 1:
+            waveform = waveform.unsqueeze(0)
+        if waveform.shape[0] > 1:
+            waveform = waveform.mean(dim=0, keepdim=True)
+        
+        # One host-to-device copy of the whole file; crops below are views into it
+        if device.type == "cuda":
+            waveform = waveform.pin_memory().to(device, non_blocking=True)
+        else:
+            waveform = waveform.to(device)
+        
+        total_samples = waveform.shape[-1]
+        crops = []
+        for spans in span_groups:
+            pieces = []
+            for start, end in spans:
+                first = min(max(int(start * sample_rate), 0), total_samples - 1)
+                last = min(max(int(end * sample_rate), first + 1), total_samples)
+                pieces.append(waveform[:, first:last])
+            crops.append(pieces[0] if len(pieces) == 1 else torch.cat(pieces, dim=-1))
+        
+        dtype = self.embedding_dtype
+        max_len = max(crop.shape[-1] for crop in crops)
+        batch = waveform.new_zeros((len(crops), 1, max_len), dtype=dtype)
+        weights = waveform.new_zeros((len(crops), max_len), dtype=dtype)
+        for index, crop in enumerate(crops):
+            batch[index, :, :crop.shape[-1]] = crop
+            weights[index, :crop.shape[-1]] = 1.0
+        
+        with torch.inference_mode(), torch.autocast(
+            device_type=device.type,
+            dtype=dtype,
+            enabled=dtype != torch.float32
+        ):
+            try:
+                embeddings = self.embedding_model(batch, weights=weights)
+            except TypeError:
+                # Model without weighted pooling support
+                embeddings = self.embedding_model(batch)
+        
+        return embeddings.float().cpu().numpy()
+    
     async def _load_models(self) -> None:
         """Load pyannote.audio models"""
         
@@ -584,8 +1130,6 @@ class SpeakerIdentificationService(ISpeakerIdentificationService):
             warnings.filterwarnings("ignore", category=FutureWarning, module="pytorch_lightning")
             
             from pyannote.audio import Model, Pipeline
-            from pyannote.audio.core.inference import Inference
-            import torch
             
             device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
             
@@ -601,6 +1145,11 @@ class SpeakerIdentificationService(ISpeakerIdentificationService):
             self.embedding_model.to(device)
             self.embedding_model.eval()
             
+            if device.type == "cuda":
+                # Tensor-core friendly weights; embeddings are cast back to float32 after the forward
+                self.embedding_dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+                self.embedding_model.to(dtype=self.embedding_dtype)
+            
             # Load diarization pipeline
             self.pipeline = await loop.run_in_executor(
                 None,
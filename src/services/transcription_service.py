@@ -4,23 +4,179 @@ Handles audio transcription logic with support for parallel processing
 """
 
 import whisper
+import bisect
 import os
+import glob
 import json
+import shutil
 import tempfile
 import subprocess
+import threading
+from collections import Counter
+from dataclasses import dataclass
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List, Optional
+
+import numpy as np
+
+# CTranslate2 backend (int8 GEMM kernels); openai-whisper remains the fallback
+try:
+    from faster_whisper import WhisperModel, BatchedInferencePipeline
+    FASTER_WHISPER_AVAILABLE = True
+except ImportError:
+    FASTER_WHISPER_AVAILABLE = False
+
+# In-process decoding (PyAV ships with faster-whisper); ffmpeg subprocesses otherwise
+try:
+    import av
+    AV_AVAILABLE = True
+except ImportError:
+    AV_AVAILABLE = False
+
+# JIT-compiled overlap search for segment-heavy recordings
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Whisper's native sample rate
+WHISPER_SAMPLE_RATE = 16000
+
+# Below this many transcription segments the NumPy overlap search beats JIT dispatch
+NUMBA_MIN_SEGMENTS = 256
+
+# Quiet, non-interactive ffmpeg using every core for decoding
+FFMPEG_BASE_ARGS = ["ffmpeg", "-nostdin", "-hide_banner", "-loglevel", "error", "-threads", "0"]
+
+# Pauses shorter than this between transcription segments stay in the diarized audio
+VOICED_SPAN_GAP = 1.0
+
+# Options shared by every Whisper call; per-call values are merged on top.
+# Verbose output is off to keep per-segment printing out of the decode loop.
+BASE_TRANSCRIBE_OPTIONS = {"task": "transcribe", "verbose": False}
+
+# Write buffer for TXT/SRT output files
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+
+@dataclass(slots=True)
+class TranscriptSegment:
+    """Transcription segment with its assigned speaker"""
+    start: float
+    end: float
+    text: str
+    speaker: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {"start": self.start, "end": self.end, "text": self.text, "speaker": self.speaker}
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _overlap_pairs_numba(trans_starts, trans_ends, sp_starts, sp_ends, max_ends):
+        first = np.searchsorted(max_ends, trans_starts, side="right")
+        last = np.searchsorted(sp_starts, trans_ends, side="left")
+        
+        count = 0
+        for i in range(len(trans_starts)):
+            for j in range(first[i], last[i]):
+                if min(sp_ends[j], trans_ends[i]) - max(sp_starts[j], trans_starts[i]) > 0:
+                    count += 1
+        
+        trans_index = np.empty(count, dtype=np.int64)
+        speaker_pos = np.empty(count, dtype=np.int64)
+        overlap_starts = np.empty(count, dtype=np.float64)
+        overlap_ends = np.empty(count, dtype=np.float64)
+        k = 0
+        for i in range(len(trans_starts)):
+            for j in range(first[i], last[i]):
+                overlap_start = max(sp_starts[j], trans_starts[i])
+                overlap_end = min(sp_ends[j], trans_ends[i])
+                if overlap_end - overlap_start > 0:
+                    trans_index[k] = i
+                    speaker_pos[k] = j
+                    overlap_starts[k] = overlap_start
+                    overlap_ends[k] = overlap_end
+                    k += 1
+        return trans_index, speaker_pos, overlap_starts, overlap_ends
+
+
+def _overlap_pairs(trans_starts, trans_ends, sp_starts, sp_ends) -> tuple:
+    """
+    All (transcription segment, speaker turn) pairs with a positive overlap.
+    Speaker turns must be sorted by start. Returns (trans_index, speaker_pos,
+    overlap_starts, overlap_ends) ordered by segment, then by speaker position.
+    """
+    # Running max of turn ends bounds the slice of turns that can reach each segment
+    max_ends = np.maximum.accumulate(sp_ends) if len(sp_ends) else sp_ends
+    
+    if NUMBA_AVAILABLE and len(trans_starts) >= NUMBA_MIN_SEGMENTS:
+        return _overlap_pairs_numba(trans_starts, trans_ends, sp_starts, sp_ends, max_ends)
+    
+    first = np.searchsorted(max_ends, trans_starts, side="right")
+    last = np.searchsorted(sp_starts, trans_ends, side="left")
+    lengths = np.maximum(last - first, 0)
+    
+    # Expand every segment's candidate slice into flat pair arrays
+    trans_index = np.repeat(np.arange(len(trans_starts)), lengths)
+    offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    speaker_pos = np.repeat(first, lengths) + offsets
+    overlap_starts = np.maximum(sp_starts[speaker_pos], trans_starts[trans_index])
+    overlap_ends = np.minimum(sp_ends[speaker_pos], trans_ends[trans_index])
+    
+    hits = overlap_ends - overlap_starts > 0
+    return trans_index[hits], speaker_pos[hits], overlap_starts[hits], overlap_ends[hits]
+
+
+def detect_compute_type() -> tuple:
+    """Pick (device, compute_type) for faster-whisper based on the available hardware"""
+    import torch
+    
+    if torch.cuda.is_available():
+        major, _ = torch.cuda.get_device_capability()
+        # int8 weights with fp16 activations need tensor cores (Volta and newer)
+        return "cuda", "int8_float16" if major >= 7 else "float16"
+    return "cpu", "int8"
 
 
 class TranscriptionService:
     """Service for handling audio transcription"""
     
+    # Loaded models are shared by every instance in the process; a service is
+    # created per request, so instance-level caching would never hit
+    _model_cache: Dict[tuple, Any] = {}
+    _diarization_pipeline = None
+    _model_lock = threading.Lock()
+    
     def __init__(self, cache_dir: str = "/tmp"):
         self.cache_dir = cache_dir
         
     def _load_cached_model(self, model_size: str = "turbo"):
+        """Return the process-wide Whisper model for model_size, loading it on first use"""
+        key = (model_size, FASTER_WHISPER_AVAILABLE)
+        with self._model_lock:
+            if key not in self._model_cache:
+                self._model_cache[key] = self._load_model(model_size)
+            return self._model_cache[key]
+    
+    def _load_model(self, model_size: str = "turbo"):
         """Load Whisper model from cache directory if available"""
+        if FASTER_WHISPER_AVAILABLE:
+            model_cache_dir = "/model"
+            device, compute_type = detect_compute_type()
+            # Prefer weights quantized at image build time over downloading published ones
+            converted_dir = os.path.join(model_cache_dir, f"{model_size}-ct2")
+            model_path = converted_dir if os.path.isdir(converted_dir) else model_size
+            print(f"📦 Loading faster-whisper {model_path} model ({device}, {compute_type})")
+            return WhisperModel(
+                model_path,
+                device=device,
+                compute_type=compute_type,
+                download_root=model_cache_dir if os.path.exists(model_cache_dir) else None
+            )
+        
         try:
             # Try to load from preloaded cache first
             model_cache_dir = "/model"
@@ -38,6 +194,13 @@ class TranscriptionService:
             return whisper.load_model(model_size)
     
     def _load_speaker_diarization_pipeline(self):
+        """Return the process-wide diarization pipeline, loading it on first use"""
+        with self._model_lock:
+            if TranscriptionService._diarization_pipeline is None:
+                TranscriptionService._diarization_pipeline = self._load_diarization_pipeline()
+            return TranscriptionService._diarization_pipeline
+    
+    def _load_diarization_pipeline(self):
         """Load speaker diarization pipeline from cache if available"""
         try:
             speaker_cache_dir = "/model/speaker-diarization"
@@ -58,7 +221,7 @@ class TranscriptionService:
                     cache_dir="/model/speaker-diarization"
                 )
                 print("✅ Successfully loaded speaker diarization pipeline from cache")
-                return pipeline
+                return self._move_pipeline_to_gpu(pipeline)
             else:
                 print("⚠️ Speaker diarization cache not found, downloading...")
                 # Download fresh if cache not available
@@ -80,11 +243,37 @@ class TranscriptionService:
                 with open(config_file, "w") as f:
                     json.dump(config, f)
                 
-                return pipeline
+                return self._move_pipeline_to_gpu(pipeline)
         except Exception as e:
             print(f"⚠️ Failed to load speaker diarization pipeline: {e}")
             return None
         
+    def _move_pipeline_to_gpu(self, pipeline):
+        """Run diarization segmentation and embedding on CUDA when available"""
+        import torch
+        
+        if torch.cuda.is_available():
+            pipeline.to(torch.device("cuda"))
+            print("🚀 Speaker diarization pipeline moved to GPU")
+        return pipeline
+    
+    def _load_waveform(self, audio_file_path: str) -> tuple:
+        """Decode an audio file once: (mono waveform tensor (1, samples), sample_rate)"""
+        import torchaudio
+        
+        waveform, sample_rate = torchaudio.load(audio_file_path)
+        if waveform.shape[0] > 1:
+            waveform = waveform.mean(dim=0, keepdim=True)
+        return waveform, sample_rate
+    
+    def _whisper_input(self, waveform, sample_rate: int):
+        """Whisper's expected input from a decoded waveform: float32 numpy, mono, 16 kHz"""
+        import torchaudio
+        
+        if sample_rate != 16000:
+            waveform = torchaudio.functional.resample(waveform, sample_rate, 16000)
+        return waveform.squeeze(0).numpy()
+    
     def transcribe_audio(
         self,
         audio_file_path: str,
@@ -126,14 +315,25 @@ class TranscriptionService:
                     enable_speaker_diarization = False
             
             # Transcribe audio
-            transcribe_options = {
+            transcribe_options = BASE_TRANSCRIBE_OPTIONS | {
                 "language": language if language and language != "auto" else None,
-                "task": "transcribe",
-                "verbose": True
+                # Per-segment printing blocks the decode loop; opt in for debugging
+                "verbose": os.environ.get("WHISPER_VERBOSE") == "1"
             }
             
+            # With diarization the file is decoded once and shared by both models
+            audio_input = audio_file_path
+            waveform = None
+            if enable_speaker_diarization and speaker_pipeline:
+                try:
+                    waveform, sample_rate = self._load_waveform(audio_file_path)
+                    audio_input = self._whisper_input(waveform, sample_rate)
+                except Exception as e:
+                    print(f"⚠️ Failed to preload waveform, decoding from file: {e}")
+                    waveform = None
+            
             print(f"🔄 Transcribing with options: {transcribe_options}")
-            result = model.transcribe(audio_file_path, **transcribe_options)
+            result = self._run_model(model, audio_input, transcribe_options)
             
             # Extract information
             text = result.get("text", "").strip()
@@ -145,21 +345,22 @@ class TranscriptionService:
             global_speaker_count = 0
             speaker_summary = {}
             
-            if enable_speaker_diarization and speaker_pipeline:
+            if enable_speaker_diarization and speaker_pipeline and not segments:
+                print("⚠️ No speech transcribed, skipping speaker diarization")
+            elif enable_speaker_diarization and speaker_pipeline:
                 try:
                     print("👥 Applying speaker diarization...")
-                    diarization_result = speaker_pipeline(audio_file_path)
+                    if waveform is not None:
+                        speaker_segments = self._diarize_voiced_spans(speaker_pipeline, waveform, sample_rate, segments)
+                    else:
+                        diarization_result = speaker_pipeline(audio_file_path)
+                        speaker_segments = [
+                            {"start": turn.start, "end": turn.end, "speaker": speaker}
+                            for turn, _, speaker in diarization_result.itertracks(yield_label=True)
+                        ]
                     
                     # Process diarization results
-                    speakers = set()
-                    for turn, _, speaker in diarization_result.itertracks(yield_label=True):
-                        speakers.add(speaker)
-                        speaker_segments.append({
-                            "start": turn.start,
-                            "end": turn.end,
-                            "speaker": speaker
-                        })
-                    
+                    speakers = {seg["speaker"] for seg in speaker_segments}
                     global_speaker_count = len(speakers)
                     speaker_summary = {f"SPEAKER_{i:02d}": speaker for i, speaker in enumerate(sorted(speakers))}
                     
@@ -217,61 +418,144 @@ class TranscriptionService:
             print(f"❌ Transcription failed: {e}")
             return self._create_error_result(audio_file_path, model_size, str(e))
     
+    def _voiced_spans(self, segments: List[Dict]) -> List[List[float]]:
+        """Time spans covered by transcription segments, merged across short pauses"""
+        spans = []
+        for start, end in sorted((seg.get("start", 0), seg.get("end", 0)) for seg in segments):
+            if spans and start - spans[-1][1] < VOICED_SPAN_GAP:
+                spans[-1][1] = max(spans[-1][1], end)
+            else:
+                spans.append([start, end])
+        return spans
+    
+    def _diarize_voiced_spans(self, speaker_pipeline, waveform, sample_rate: int, segments: List[Dict]) -> List[Dict]:
+        """
+        Diarize only the audio Whisper found speech in. Voiced spans are concatenated
+        and diarized in a single call, so speaker labels stay consistent across spans,
+        then the turns are mapped back onto the file's timeline.
+        """
+        import torch
+        
+        spans = self._voiced_spans(segments)
+        pieces = [waveform[:, int(start * sample_rate):int(end * sample_rate)] for start, end in spans]
+        diarization_result = speaker_pipeline({"waveform": torch.cat(pieces, dim=1), "sample_rate": sample_rate})
+        
+        # Start of each span on the concatenated timeline, plus the overall end
+        offsets = np.concatenate(([0.0], np.cumsum([piece.shape[1] / sample_rate for piece in pieces]))).tolist()
+        
+        speaker_segments = []
+        for turn, _, speaker in diarization_result.itertracks(yield_label=True):
+            # A turn crossing a span boundary is split at the removed silence
+            k = max(bisect.bisect_right(offsets, turn.start) - 1, 0)
+            while k < len(spans) and offsets[k] < turn.end:
+                start = max(turn.start, offsets[k])
+                end = min(turn.end, offsets[k + 1])
+                if end > start:
+                    shift = spans[k][0] - offsets[k]
+                    speaker_segments.append({"start": start + shift, "end": end + shift, "speaker": speaker})
+                k += 1
+        
+        return speaker_segments
+    
+    def _run_model(
+        self,
+        model,
+        audio,
+        transcribe_options: Dict[str, Any],
+        batch_size: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Run either backend and return the openai-whisper result shape:
+        {"text", "segments": [{"start", "end", "text"}], "language"}
+        
+        With batch_size > 0 (faster-whisper only), VAD-split windows of the whole
+        file are packed into batched encoder passes.
+        """
+        if FASTER_WHISPER_AVAILABLE and isinstance(model, WhisperModel):
+            runner = BatchedInferencePipeline(model=model) if batch_size > 0 else model
+            extra_options = {"batch_size": batch_size} if batch_size > 0 else {}
+            segments, info = runner.transcribe(
+                audio,
+                language=transcribe_options.get("language"),
+                task=transcribe_options.get("task", "transcribe"),
+                beam_size=1,
+                vad_filter=True,
+                **extra_options
+            )
+            # The segment generator drives decoding, so it is consumed exactly once here
+            segments = [
+                {"id": seg.id, "start": seg.start, "end": seg.end, "text": seg.text}
+                for seg in segments
+            ]
+            return {
+                "text": "".join(seg["text"] for seg in segments).strip(),
+                "segments": segments,
+                "language": info.language
+            }
+        
+        return model.transcribe(audio, **transcribe_options)
+    
     def _merge_speaker_segments(self, transcription_segments: List[Dict], speaker_segments: List[Dict]) -> List[Dict]:
         """
         Merge speaker information with transcription segments, splitting transcription segments
         when multiple speakers are detected within a single segment
         """
         merged_segments = []
+        segments = [
+            TranscriptSegment(seg.get("start", 0), seg.get("end", 0), seg.get("text", "").strip())
+            for seg in transcription_segments
+        ]
         
-        for trans_seg in transcription_segments:
-            trans_start = trans_seg.get("start", 0)
-            trans_end = trans_seg.get("end", 0)
-            trans_text = trans_seg.get("text", "").strip()
+        # Speaker turns sorted by start; every overlapping pair is found in one pass
+        raw_starts = np.array([seg["start"] for seg in speaker_segments], dtype=np.float64)
+        order = np.argsort(raw_starts, kind="stable")
+        trans_index, speaker_pos, overlap_starts, overlap_ends = _overlap_pairs(
+            np.array([seg.start for seg in segments], dtype=np.float64),
+            np.array([seg.end for seg in segments], dtype=np.float64),
+            raw_starts[order],
+            np.array([seg["end"] for seg in speaker_segments], dtype=np.float64)[order]
+        )
+        
+        # Per segment, ordered by overlap start with ties in the caller's order
+        speaker_index = order[speaker_pos]
+        pair_order = np.lexsort((speaker_index, overlap_starts, trans_index))
+        pair_bounds = np.searchsorted(trans_index[pair_order], np.arange(len(segments) + 1)).tolist()
+        speaker_index = speaker_index[pair_order].tolist()
+        overlap_starts = overlap_starts[pair_order].tolist()
+        overlap_ends = overlap_ends[pair_order].tolist()
+        
+        for i, seg in enumerate(segments):
+            first, last = pair_bounds[i], pair_bounds[i + 1]
             
-            # Find all overlapping speaker segments
-            overlapping_speakers = []
-            for speaker_seg in speaker_segments:
-                speaker_start = speaker_seg["start"]
-                speaker_end = speaker_seg["end"]
-                
-                # Check if there's any overlap
-                overlap_start = max(trans_start, speaker_start)
-                overlap_end = min(trans_end, speaker_end)
-                overlap_duration = max(0, overlap_end - overlap_start)
-                
-                if overlap_duration > 0:
-                    overlapping_speakers.append({
-                        "speaker": speaker_seg["speaker"],
-                        "start": speaker_start,
-                        "end": speaker_end,
-                        "overlap_start": overlap_start,
-                        "overlap_end": overlap_end,
-                        "overlap_duration": overlap_duration
-                    })
-            
-            if not overlapping_speakers:
+            if first == last:
                 # No speaker detected, keep original segment
-                merged_seg = trans_seg.copy()
-                merged_seg["speaker"] = None
-                merged_segments.append(merged_seg)
+                merged_segments.append(seg.to_dict())
                 continue
             
-            # Sort overlapping speakers by start time
-            overlapping_speakers.sort(key=lambda x: x["overlap_start"])
-            
-            if len(overlapping_speakers) == 1:
+            if last - first == 1:
                 # Single speaker for this transcription segment
-                merged_seg = trans_seg.copy()
-                merged_seg["speaker"] = overlapping_speakers[0]["speaker"]
-                merged_segments.append(merged_seg)
-            else:
-                # Multiple speakers detected - split the transcription segment
-                print(f"🔄 Splitting segment ({trans_start:.2f}s-{trans_end:.2f}s) with {len(overlapping_speakers)} speakers")
-                split_segments = self._split_transcription_segment(
-                    trans_seg, overlapping_speakers, trans_text
-                )
-                merged_segments.extend(split_segments)
+                seg.speaker = speaker_segments[speaker_index[first]]["speaker"]
+                merged_segments.append(seg.to_dict())
+                continue
+            
+            # Multiple speakers detected - split the transcription segment
+            overlapping_speakers = []
+            for k in range(first, last):
+                speaker_seg = speaker_segments[speaker_index[k]]
+                overlapping_speakers.append({
+                    "speaker": speaker_seg["speaker"],
+                    "start": speaker_seg["start"],
+                    "end": speaker_seg["end"],
+                    "overlap_start": overlap_starts[k],
+                    "overlap_end": overlap_ends[k],
+                    "overlap_duration": overlap_ends[k] - overlap_starts[k]
+                })
+            
+            print(f"🔄 Splitting segment ({seg.start:.2f}s-{seg.end:.2f}s) with {len(overlapping_speakers)} speakers")
+            split_segments = self._split_transcription_segment(
+                transcription_segments[i], overlapping_speakers, seg.text
+            )
+            merged_segments.extend(split_segments)
         
         return merged_segments
     
@@ -280,46 +564,34 @@ class TranscriptionService:
         Split a transcription segment into multiple segments based on speaker changes
         """
         split_segments = []
-        trans_start = trans_seg.get("start", 0)
-        trans_end = trans_seg.get("end", 0)
-        trans_duration = trans_end - trans_start
-        
-        # Calculate the proportion of text for each speaker based on overlap duration
-        total_overlap_duration = sum(sp["overlap_duration"] for sp in overlapping_speakers)
-        
-        if total_overlap_duration == 0:
-            # Fallback: equal distribution
-            text_per_speaker = len(trans_text) // len(overlapping_speakers)
-        
-        current_text_pos = 0
-        for i, speaker_info in enumerate(overlapping_speakers):
-            # Calculate text portion for this speaker
-            if total_overlap_duration > 0:
-                text_proportion = speaker_info["overlap_duration"] / total_overlap_duration
-            else:
-                text_proportion = 1.0 / len(overlapping_speakers)
-            
-            # Calculate text length for this speaker
-            if i == len(overlapping_speakers) - 1:
-                # Last speaker gets remaining text
-                speaker_text_length = len(trans_text) - current_text_pos
-            else:
-                speaker_text_length = int(len(trans_text) * text_proportion)
-            
-            # Extract text for this speaker
-            speaker_text_end = min(current_text_pos + speaker_text_length, len(trans_text))
-            speaker_text = trans_text[current_text_pos:speaker_text_end].strip()
-            
-            # Adjust word boundaries to avoid cutting words in half
-            if speaker_text_end < len(trans_text) and i < len(overlapping_speakers) - 1:
-                # Find the last complete word
-                last_space = speaker_text.rfind(' ')
-                if last_space > 0:
-                    speaker_text = speaker_text[:last_space]
-                    speaker_text_end = current_text_pos + last_space + 1  # +1 to skip the space
-                else:
-                    # If no space found, keep original text but update position
-                    speaker_text_end = current_text_pos + speaker_text_length
+        speaker_count = len(overlapping_speakers)
+        
+        # Text proportion for each speaker based on overlap duration, equal if there is none
+        durations = np.array([sp["overlap_duration"] for sp in overlapping_speakers], dtype=np.float64)
+        total_overlap_duration = durations.sum()
+        if total_overlap_duration > 0:
+            proportions = durations / total_overlap_duration
+        else:
+            proportions = np.full(speaker_count, 1.0 / speaker_count)
+        
+        # Cumulative cut points; the last speaker always ends at the end of the text
+        bounds = np.rint(np.cumsum(proportions) * len(trans_text)).astype(np.int64)
+        bounds[-1] = len(trans_text)
+        
+        # Snap inner cut points to the nearest space to avoid cutting words in half
+        # (UTF-32 gives one code unit per character, so indices match the str)
+        spaces = np.flatnonzero(np.frombuffer(trans_text.encode("utf-32-le"), dtype=np.uint32) == 0x20)
+        if len(spaces) and speaker_count > 1:
+            cuts = bounds[:-1]
+            right_index = np.searchsorted(spaces, cuts).clip(max=len(spaces) - 1)
+            left = spaces[(right_index - 1).clip(min=0)]
+            right = spaces[right_index]
+            bounds[:-1] = np.where(np.abs(cuts - left) <= np.abs(right - cuts), left, right)
+        bounds = np.maximum.accumulate(bounds)
+        starts = np.concatenate(([0], bounds[:-1]))
+        
+        for speaker_info, text_start, text_end in zip(overlapping_speakers, starts.tolist(), bounds.tolist()):
+            speaker_text = trans_text[text_start:text_end].strip()
             
             # Use actual speaker diarization timing directly
             segment_start = speaker_info["overlap_start"]
@@ -335,8 +607,6 @@ class TranscriptionService:
                 }
                 split_segments.append(split_segment)
                 print(f"   → {speaker_info['speaker']}: {segment_start:.2f}s-{segment_end:.2f}s: \"{speaker_text[:50]}{'...' if len(speaker_text) > 50 else ''}\"")
-            
-            current_text_pos = speaker_text_end
         
         return split_segments
     
@@ -383,13 +653,29 @@ class TranscriptionService:
                     audio_file_path, model_size, language, output_format, enable_speaker_diarization
                 )
             
-            # Split audio into chunks
-            chunks = self._split_audio_into_chunks(audio_file_path, chunk_duration, total_duration)
-            print(f"🔀 Created {len(chunks)} chunks for parallel processing")
-            
             # Load Whisper model once from cache
             model = self._load_cached_model(model_size)
             
+            if FASTER_WHISPER_AVAILABLE and isinstance(model, WhisperModel):
+                # Batched pipeline does its own VAD chunking, no ffmpeg splitting needed
+                chunk_results = [self._transcribe_batched(model, audio_file_path, language)]
+                return self._combine_chunk_results(
+                    chunk_results, audio_file_path, model_size,
+                    enable_speaker_diarization, total_duration
+                )
+            
+            # Split audio into chunks: in-memory slices of one decode when possible,
+            # otherwise WAV files written by ffmpeg
+            chunks = None
+            try:
+                audio = self._audio_on_model_device(self._decode_audio(audio_file_path), model)
+                chunks = self._slice_audio_into_chunks(audio, chunk_duration, total_duration)
+            except Exception as e:
+                print(f"⚠️ Decoding to memory failed, falling back to chunk files: {e}")
+            if chunks is None:
+                chunks = self._split_audio_into_chunks(audio_file_path, chunk_duration, total_duration)
+            print(f"🔀 Created {len(chunks)} chunks for parallel processing")
+            
             # Process chunks in parallel
             chunk_results = self._process_chunks_parallel(chunks, model, language)
             
@@ -427,7 +713,7 @@ class TranscriptionService:
         
         # Convert to standardized format: 16kHz, mono, PCM
         cmd = [
-            "ffmpeg", "-i", input_file,
+            *FFMPEG_BASE_ARGS, "-i", input_file,
             "-ar", "16000",  # 16kHz sample rate (Whisper's native)
             "-ac", "1",      # Mono channel
             "-c:a", "pcm_s16le",  # PCM 16-bit encoding
@@ -444,58 +730,179 @@ class TranscriptionService:
             return output_file
     
     def _get_audio_duration(self, audio_file_path: str) -> float:
-        """Get audio duration using ffprobe"""
+        """Get audio duration from the container header, falling back to ffprobe"""
+        if AV_AVAILABLE:
+            try:
+                with av.open(audio_file_path) as container:
+                    if container.duration is not None:
+                        return float(container.duration) / av.time_base
+            except Exception as e:
+                print(f"⚠️ Failed to read duration in-process, using ffprobe: {e}")
+        
         cmd = ["ffprobe", "-v", "quiet", "-show_entries", "format=duration", "-of", "csv=p=0", audio_file_path]
         duration_output = subprocess.run(cmd, capture_output=True, text=True)
         return float(duration_output.stdout.strip())
     
-    def _split_audio_into_chunks(self, audio_file_path: str, chunk_duration: int, total_duration: float) -> List[Dict]:
-        """Split audio file into chunks for parallel processing"""
+    def _decode_audio(self, audio_file_path: str) -> np.ndarray:
+        """Decode a file once into a float32 mono 16 kHz buffer, with PyAV or an ffmpeg pipe"""
+        if not AV_AVAILABLE:
+            cmd = [
+                *FFMPEG_BASE_ARGS, "-i", audio_file_path,
+                "-ar", str(WHISPER_SAMPLE_RATE),
+                "-ac", "1",
+                "-f", "s16le",  # Raw PCM on stdout, no intermediate file
+                "-"
+            ]
+            result = subprocess.run(cmd, capture_output=True)
+            if result.returncode != 0:
+                raise RuntimeError(f"ffmpeg decoding failed: {result.stderr.decode(errors='replace').strip()}")
+            return np.frombuffer(result.stdout, dtype=np.int16).astype(np.float32) / 32768.0
+        
+        pieces = []
+        with av.open(audio_file_path) as container:
+            resampler = av.AudioResampler(format="s16", layout="mono", rate=WHISPER_SAMPLE_RATE)
+            for frame in container.decode(audio=0):
+                for resampled in resampler.resample(frame):
+                    pieces.append(resampled.to_ndarray().reshape(-1))
+            # Flush samples buffered inside the resampler
+            for resampled in resampler.resample(None):
+                pieces.append(resampled.to_ndarray().reshape(-1))
+        
+        if not pieces:
+            return np.zeros(0, dtype=np.float32)
+        return np.concatenate(pieces).astype(np.float32) / 32768.0
+    
+    def _audio_on_model_device(self, audio: np.ndarray, model):
+        """
+        Upload the decoded buffer to the model's GPU once. Chunk slices are then
+        device views, so Whisper computes each chunk's log-mel STFT on the GPU
+        instead of on the CPU followed by a host-to-device copy per chunk.
+        """
+        import torch
+        
+        device = getattr(model, "device", None)
+        if not isinstance(device, torch.device) or device.type != "cuda":
+            return audio
+        return torch.from_numpy(audio).to(device)
+    
+    def _slice_audio_into_chunks(self, audio: np.ndarray, chunk_duration: int, total_duration: float) -> List[Dict]:
+        """Cut a decoded buffer into chunk views; no files are written"""
         chunks = []
-        temp_dir = tempfile.mkdtemp()
         
         for i in range(0, int(total_duration), chunk_duration):
             chunk_start = i
             chunk_end = min(i + chunk_duration, total_duration)
-            chunk_file = os.path.join(temp_dir, f"chunk_{i//chunk_duration:03d}.wav")
+            chunk_audio = audio[int(chunk_start * WHISPER_SAMPLE_RATE):int(chunk_end * WHISPER_SAMPLE_RATE)]
             
-            # Extract chunk using ffmpeg
-            cmd = [
-                "ffmpeg", "-i", audio_file_path,
-                "-ss", str(chunk_start),
-                "-t", str(chunk_end - chunk_start),
-                "-c:a", "pcm_s16le",  # Use PCM encoding for better quality
-                "-ar", "16000",  # 16kHz sample rate for Whisper
-                chunk_file
-            ]
-            
-            subprocess.run(cmd, capture_output=True)
-            
-            if os.path.exists(chunk_file):
+            if len(chunk_audio):
                 chunks.append({
-                    "file": chunk_file,
+                    "audio": chunk_audio,
                     "start_time": chunk_start,
                     "end_time": chunk_end,
-                    "index": len(chunks),
-                    "temp_dir": temp_dir
+                    "index": len(chunks)
                 })
                 print(f"📦 Created chunk {len(chunks)}: {chunk_start:.1f}s-{chunk_end:.1f}s")
         
         return chunks
     
+    def _split_audio_into_chunks(self, audio_file_path: str, chunk_duration: int, total_duration: float) -> List[Dict]:
+        """Split audio file into chunks for parallel processing"""
+        chunks = []
+        temp_dir = tempfile.mkdtemp()
+        
+        # Single pass: the segment muxer decodes the input once and emits every chunk
+        cmd = [
+            *FFMPEG_BASE_ARGS, "-i", audio_file_path,
+            "-f", "segment",
+            "-segment_time", str(chunk_duration),
+            "-reset_timestamps", "1",
+            "-c:a", "pcm_s16le",  # Use PCM encoding for better quality
+            "-ar", "16000",  # 16kHz sample rate for Whisper
+            "-ac", "1",
+            os.path.join(temp_dir, "chunk_%03d.wav")
+        ]
+        subprocess.run(cmd, capture_output=True)
+        chunk_files = sorted(glob.glob(os.path.join(temp_dir, "chunk_*.wav")))
+        
+        if not chunk_files:
+            # Fallback: one ffmpeg call per chunk, seeking the input before decoding
+            for i in range(0, int(total_duration), chunk_duration):
+                chunk_file = os.path.join(temp_dir, f"chunk_{i//chunk_duration:03d}.wav")
+                cmd = [
+                    *FFMPEG_BASE_ARGS, "-ss", str(i),
+                    "-i", audio_file_path,
+                    "-t", str(min(i + chunk_duration, total_duration) - i),
+                    "-c:a", "pcm_s16le",
+                    "-ar", "16000",
+                    "-ac", "1",
+                    chunk_file
+                ]
+                subprocess.run(cmd, capture_output=True)
+                if os.path.exists(chunk_file):
+                    chunk_files.append(chunk_file)
+        
+        for chunk_file in chunk_files:
+            chunk_start = int(Path(chunk_file).stem.split("_")[1]) * chunk_duration
+            chunk_end = min(chunk_start + chunk_duration, total_duration)
+            chunks.append({
+                "file": chunk_file,
+                "start_time": chunk_start,
+                "end_time": chunk_end,
+                "index": len(chunks),
+                "temp_dir": temp_dir
+            })
+            print(f"📦 Created chunk {len(chunks)}: {chunk_start:.1f}s-{chunk_end:.1f}s")
+        
+        return chunks
+    
+    def _transcribe_batched(self, model, audio_file_path: str, language: str, batch_size: int = 16) -> Dict:
+        """Transcribe a whole file with faster-whisper's batched pipeline as a single chunk result"""
+        print(f"🔄 Transcribing with batched inference (batch size {batch_size})")
+        
+        transcribe_options = BASE_TRANSCRIBE_OPTIONS | {
+            "language": language if language and language != "auto" else None
+        }
+        result = self._run_model(model, audio_file_path, transcribe_options, batch_size=batch_size)
+        
+        segments = [
+            {
+                "start": seg["start"],
+                "end": seg["end"],
+                "text": seg["text"].strip(),
+                "speaker": None
+            }
+            for seg in result["segments"]
+        ]
+        print(f"✅ Batched transcription completed: {len(segments)} segments")
+        
+        return {
+            "text": result["text"],
+            "segments": segments,
+            "language": result["language"],
+            "chunk_index": 0
+        }
+    
     def _process_chunks_parallel(self, chunks: List[Dict], model, language: str) -> List[Dict]:
         """Process audio chunks in parallel"""
+        max_workers = min(len(chunks), 8)
+        streams = self._chunk_streams(model, max_workers)
+        # Same options for every chunk; Whisper only reads them
+        transcribe_options = BASE_TRANSCRIBE_OPTIONS | {
+            "language": language if language and language != "auto" else None
+        }
+        
         def process_chunk(chunk_info):
             try:
                 print(f"🔄 Processing chunk {chunk_info['index']}: {chunk_info['start_time']:.1f}s-{chunk_info['end_time']:.1f}s")
                 
-                transcribe_options = {
-                    "language": language if language and language != "auto" else None,
-                    "task": "transcribe",
-                    "verbose": False  # Reduce verbosity for parallel processing
-                }
-                
-                result = model.transcribe(chunk_info["file"], **transcribe_options)
+                audio_input = chunk_info["audio"] if "audio" in chunk_info else chunk_info["file"]
+                if streams:
+                    import torch
+                    
+                    with torch.cuda.stream(streams[chunk_info["index"] % len(streams)]):
+                        result = self._run_model(model, audio_input, transcribe_options)
+                else:
+                    result = self._run_model(model, audio_input, transcribe_options)
                 
                 # Adjust segment timing to global timeline
                 segments = []
@@ -528,13 +935,32 @@ class TranscriptionService:
                 }
         
         # Process chunks in parallel using ThreadPoolExecutor
-        with ThreadPoolExecutor(max_workers=min(len(chunks), 8)) as executor:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
             chunk_results = list(executor.map(process_chunk, chunks))
         
         # Sort results by chunk index
         chunk_results.sort(key=lambda x: x["chunk_index"])
         return chunk_results
     
+    def _chunk_streams(self, model, count: int) -> List:
+        """
+        One CUDA stream per worker thread for a GPU-resident openai-whisper model,
+        so one chunk's encoder pass can overlap another chunk's decoder steps
+        instead of every thread queueing on the default stream
+        """
+        import torch
+        
+        device = getattr(model, "device", None)
+        if not isinstance(device, torch.device) or device.type != "cuda":
+            return []
+        streams = [torch.cuda.Stream(device=device) for _ in range(count)]
+        # The audio upload was queued on the current stream; side streams must not
+        # read the chunk views before that host-to-device copy has finished
+        current = torch.cuda.current_stream(device)
+        for stream in streams:
+            stream.wait_stream(current)
+        return streams
+    
     def _combine_chunk_results(
         self, 
         chunk_results: List[Dict], 
@@ -554,8 +980,8 @@ class TranscriptionService:
         all_segments.sort(key=lambda x: x["start"])
         
         # Get detected language (use most common one)
-        languages = [chunk["language"] for chunk in chunk_results if chunk["language"] != "unknown"]
-        language_detected = max(set(languages), key=languages.count) if languages else "unknown"
+        language_counts = Counter(chunk["language"] for chunk in chunk_results if chunk["language"] != "unknown")
+        language_detected = language_counts.most_common(1)[0][0] if language_counts else "unknown"
         
         # Generate output files
         output_files = self._generate_output_files(
@@ -590,21 +1016,9 @@ class TranscriptionService:
     
     def _cleanup_chunks(self, chunks: List[Dict]):
         """Clean up temporary chunk files"""
-        temp_dirs = set()
-        for chunk in chunks:
-            try:
-                if os.path.exists(chunk["file"]):
-                    os.remove(chunk["file"])
-                temp_dirs.add(chunk["temp_dir"])
-            except Exception as e:
-                print(f"⚠️ Failed to cleanup chunk file: {e}")
-        
-        # Remove temp directories
-        for temp_dir in temp_dirs:
-            try:
-                os.rmdir(temp_dir)
-            except Exception as e:
-                print(f"⚠️ Failed to cleanup temp directory: {e}")
+        # In-memory chunks have no temp directory; each split directory holds only its chunks
+        for temp_dir in {chunk["temp_dir"] for chunk in chunks if "temp_dir" in chunk}:
+            shutil.rmtree(temp_dir, ignore_errors=True)
     
     def _generate_output_files(
         self, 
@@ -620,44 +1034,45 @@ class TranscriptionService:
         # Generate TXT file
         if text:
             txt_file = f"{base_path}.txt"
-            with open(txt_file, 'w', encoding='utf-8') as f:
+            with open(txt_file, 'w', encoding='utf-8', buffering=OUTPUT_BUFFER_SIZE) as f:
                 f.write(text)
             output_files["txt_file"] = txt_file
         
-        # Generate SRT file
+        # Generate SRT file, streamed block by block instead of joined in memory
         if segments:
             srt_file = f"{base_path}.srt"
-            srt_content = self._generate_srt_content(segments, enable_speaker_diarization)
-            with open(srt_file, 'w', encoding='utf-8') as f:
-                f.write(srt_content)
+            with open(srt_file, 'w', encoding='utf-8', buffering=OUTPUT_BUFFER_SIZE) as f:
+                f.writelines(self._iter_srt_blocks(segments, enable_speaker_diarization))
             output_files["srt_file"] = srt_file
         
         return output_files
     
     def _generate_srt_content(self, segments: List[Dict], include_speakers: bool = False) -> str:
         """Generate SRT format content from segments"""
-        srt_lines = []
+        return "".join(self._iter_srt_blocks(segments, include_speakers))
+    
+    def _iter_srt_blocks(self, segments: List[Dict], include_speakers: bool = False) -> Iterator[str]:
+        """Yield SRT content one segment block at a time"""
+        format_timestamp = self._format_timestamp
+        # Blank separator line goes before every block but the first
+        separator = ""
         
         for i, segment in enumerate(segments, 1):
-            start_time = self._format_timestamp(segment.get('start', 0))
-            end_time = self._format_timestamp(segment.get('end', 0))
             text = segment.get('text', '').strip()
             
             if include_speakers and segment.get('speaker'):
                 text = f"[{segment['speaker']}] {text}"
             
-            srt_lines.append(f"{i}")
-            srt_lines.append(f"{start_time} --> {end_time}")
-            srt_lines.append(text)
-            srt_lines.append("")  # Empty line between segments
-        
-        return "\n".join(srt_lines)
+            yield (
+                f"{separator}{i}\n{format_timestamp(segment.get('start', 0))} --> "
+                f"{format_timestamp(segment.get('end', 0))}\n{text}\n"
+            )
+            separator = "\n"
     
     def _format_timestamp(self, seconds: float) -> str:
         """Format timestamp for SRT format"""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
+        minutes, secs = divmod(int(seconds), 60)
+        hours, minutes = divmod(minutes, 60)
         milliseconds = int((seconds % 1) * 1000)
         
         return f"{hours:02d}:{minutes:02d}:{secs:02d},{milliseconds:03d}"
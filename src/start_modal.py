@@ -6,7 +6,10 @@ Sets environment variables and deploys the application to Modal
 
 import os
 import sys
-import subprocess
+from pathlib import Path
+
+# Project root, so the app is importable as src.app (as `modal deploy src.app::...` does)
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
 
 def main():
     """Deploy application to Modal"""
@@ -18,24 +21,24 @@ def main():
     os.environ["DEPLOYMENT_MODE"] = "modal"
     
     try:
-        # Deploy to Modal using modal deploy command
+        # Deploy in-process with the Modal SDK; build and deploy logs stream as they happen
+        import modal
+    except ImportError:
+        print("❌ Modal SDK not found. Please install it with: pip install modal")
+        sys.exit(1)
+    
+    try:
         print("🚀 Deploying to Modal...")
-        result = subprocess.run([
-            "modal", "deploy", "src.app::gradio_mcp_app"
-        ], check=True, capture_output=True, text=True)
+        sys.path.insert(0, str(PROJECT_ROOT))
+        from src.app import gradio_mcp_app
+        
+        with modal.enable_output():
+            gradio_mcp_app.deploy()
         
         print("✅ Successfully deployed to Modal!")
-        print("Output:", result.stdout)
         
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Modal deployment failed: {e}")
-        print("Error output:", e.stderr)
-        sys.exit(1)
-    except FileNotFoundError:
-        print("❌ Modal CLI not found. Please install it with: pip install modal")
-        sys.exit(1)
     except Exception as e:
-        print(f"❌ Unexpected error: {e}")
+        print(f"❌ Modal deployment failed: {e}")
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -3,18 +3,36 @@
 Test script to verify deployment configuration
 """
 
+import gc
 import os
 import sys
 
+# Modules that read DEPLOYMENT_MODE at import time, directly or through config
+MODE_DEPENDENT_MODULES = ("config", "app", "mcp_tools", "gpu_adapters")
+
+def _fresh_config(mode):
+    """Import config with DEPLOYMENT_MODE set to mode (unset when None), dropping every stale importer"""
+    if mode is None:
+        os.environ.pop("DEPLOYMENT_MODE", None)
+    else:
+        os.environ["DEPLOYMENT_MODE"] = mode
+    
+    for name in list(sys.modules):
+        if name.split(".")[0] in MODE_DEPENDENT_MODULES:
+            del sys.modules[name]
+    # Release the previous mode's module graph before importing the next one
+    gc.collect()
+    
+    import config
+    return config
+
 def test_local_mode():
     """Test local mode configuration"""
     print("🧪 Testing LOCAL mode configuration...")
     
-    # Set local mode
-    os.environ["DEPLOYMENT_MODE"] = "local"
-    
     try:
-        from config import is_local_mode, is_modal_mode, get_cache_dir
+        config = _fresh_config("local")
+        is_local_mode, is_modal_mode, get_cache_dir = config.is_local_mode, config.is_modal_mode, config.get_cache_dir
         
         assert is_local_mode() == True, "Should be in local mode"
         assert is_modal_mode() == False, "Should not be in modal mode"
@@ -33,15 +51,9 @@ def test_modal_mode():
     """Test modal mode configuration"""
     print("🧪 Testing MODAL mode configuration...")
     
-    # Set modal mode
-    os.environ["DEPLOYMENT_MODE"] = "modal"
-    
     try:
-        # Clear config module cache to reload with new env var
-        if 'config' in sys.modules:
-            del sys.modules['config']
-        
-        from config import is_local_mode, is_modal_mode, get_cache_dir
+        config = _fresh_config("modal")
+        is_local_mode, is_modal_mode, get_cache_dir = config.is_local_mode, config.is_modal_mode, config.get_cache_dir
         
         assert is_local_mode() == False, "Should not be in local mode"
         assert is_modal_mode() == True, "Should be in modal mode"
@@ -107,44 +119,41 @@ def test_hf_spaces_mode():
     """Test Hugging Face Spaces mode"""
     print("🧪 Testing HF Spaces mode...")
     
+    # Clear deployment mode to simulate HF Spaces
+    old_mode = os.environ.get("DEPLOYMENT_MODE")
+    
     try:
-        # Clear deployment mode to simulate HF Spaces
-        old_mode = os.environ.get("DEPLOYMENT_MODE")
-        if "DEPLOYMENT_MODE" in os.environ:
-            del os.environ["DEPLOYMENT_MODE"]
-        
-        # Clear config module cache
-        if 'config' in sys.modules:
-            del sys.modules['config']
-        if 'app' in sys.modules:
-            del sys.modules['app']
+        _fresh_config(None)
         
         from app import get_app
         
         app = get_app()
         assert app is not None, "Should create app for HF Spaces"
         
-        # Restore environment
-        if old_mode:
-            os.environ["DEPLOYMENT_MODE"] = old_mode
-        
         print("✅ HF Spaces mode OK")
         return True
         
     except Exception as e:
         print(f"❌ HF Spaces test failed: {e}")
         return False
+    finally:
+        # Restore environment
+        if old_mode:
+            os.environ["DEPLOYMENT_MODE"] = old_mode
 
 def main():
     """Run all tests"""
     print("🚀 Running deployment configuration tests...\n")
     
+    # Mode checks run first and share the cleared-module baseline; test_imports
+    # runs last so it reuses the module graph already loaded instead of forcing
+    # a second full import of app
     tests = [
-        test_imports,
         test_local_mode,
         test_modal_mode,
         test_hf_spaces_mode,
         test_gpu_adapters,
+        test_imports,
     ]
     
     passed = 0
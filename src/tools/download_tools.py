@@ -4,56 +4,44 @@ Updated to use PodcastDownloadService for local execution only
 """
 
 import asyncio
+import logging
 import os
 import json
 import time
+from functools import cache
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, TYPE_CHECKING
 
-from ..services import PodcastDownloadService, FileManagementService
-from ..models.services import PodcastDownloadRequest
+# Services are imported on first use so MCP server startup only loads the code
+# paths a session actually calls
+if TYPE_CHECKING:
+    from ..services import PodcastDownloadService, FileManagementService
 
+logger = logging.getLogger(__name__)
 
-# Global service instances for reuse
-_podcast_download_service = None
-_file_management_service = None
 
-
-def get_podcast_download_service() -> PodcastDownloadService:
+@cache
+def get_podcast_download_service() -> "PodcastDownloadService":
     """Get or create global PodcastDownloadService instance for local downloads"""
-    global _podcast_download_service
-    if _podcast_download_service is None:
-        # Use storage config for download folder
-        _podcast_download_service = PodcastDownloadService()  # Will use storage config defaults
-    return _podcast_download_service
+    from ..services import PodcastDownloadService
+    
+    # Use storage config for download folder
+    return PodcastDownloadService()  # Will use storage config defaults
 
 
-def get_file_management_service() -> FileManagementService:
+@cache
+def get_file_management_service() -> "FileManagementService":
     """Get or create global FileManagementService instance"""
-    global _file_management_service
-    if _file_management_service is None:
-        _file_management_service = FileManagementService()
-    return _file_management_service
+    from ..services import FileManagementService
+    
+    return FileManagementService()
 
 
-async def download_apple_podcast_tool(url: str) -> Dict[str, Any]:
-    """
-    Download Apple Podcast audio files and save to specified directory (LOCAL EXECUTION).
-    
-    Args:
-        url: Complete URL of Apple Podcast page
-    
-    Returns:
-        Download result dictionary containing the following key fields:
-            - "status" (str): Download status, "success" or "failed"
-            - "original_url" (str): Input original podcast URL
-            - "audio_file_path" (str|None): Complete MP3 file path when successful, None when failed
-            - "error_message" (str): Only exists when failed, contains specific error description
-    """
+async def _download_podcast(
+    service: "PodcastDownloadService", url: str, platform: str
+) -> Dict[str, Any]:
+    """Download one podcast episode with the given service and build the tool result"""
     try:
-        print(f"🏠 Downloading Apple Podcast locally: {url}")
-        service = get_podcast_download_service()
-        
         # Use local download service
         result = await service.download_podcast(
             url=url,
@@ -69,7 +57,7 @@ async def download_apple_podcast_tool(url: str) -> Dict[str, Any]:
                 "audio_file_path": result.file_path,
                 "podcast_info": {
                     "title": result.podcast_info.title if result.podcast_info else "Unknown",
-                    "platform": "Apple Podcasts"
+                    "platform": platform
                 }
             }
         else:
@@ -89,6 +77,52 @@ async def download_apple_podcast_tool(url: str) -> Dict[str, Any]:
         }
 
 
+async def download_apple_podcast_tool(url: str) -> Dict[str, Any]:
+    """
+    Download Apple Podcast audio files and save to specified directory (LOCAL EXECUTION).
+    
+    Args:
+        url: Complete URL of Apple Podcast page
+    
+    Returns:
+        Download result dictionary containing the following key fields:
+            - "status" (str): Download status, "success" or "failed"
+            - "original_url" (str): Input original podcast URL
+            - "audio_file_path" (str|None): Complete MP3 file path when successful, None when failed
+            - "error_message" (str): Only exists when failed, contains specific error description
+    """
+    logger.debug("Downloading Apple Podcast locally: %s", url)
+    return await _download_podcast(get_podcast_download_service(), url, "Apple Podcasts")
+
+
+async def download_apple_podcast_batch_tool(
+    urls: List[str],
+    max_concurrent: int = 3
+) -> List[Dict[str, Any]]:
+    """
+    Download several Apple Podcast episodes, keeping up to max_concurrent downloads
+    in flight (LOCAL EXECUTION). Each large download already opens several ranged
+    connections, so the bound keeps long URL lists from multiplying them.
+    
+    Args:
+        urls: Complete URLs of Apple Podcast pages
+        max_concurrent: Maximum number of episodes downloaded at the same time
+    
+    Returns:
+        One download result dictionary per URL, in input order, with the same
+        fields as download_apple_podcast_tool
+    """
+    logger.debug("Downloading %d Apple Podcasts locally", len(urls))
+    service = get_podcast_download_service()
+    semaphore = asyncio.Semaphore(max(1, max_concurrent))
+    
+    async def run(url: str) -> Dict[str, Any]:
+        async with semaphore:
+            return await _download_podcast(service, url, "Apple Podcasts")
+    
+    return list(await asyncio.gather(*(run(url) for url in urls)))
+
+
 async def download_xyz_podcast_tool(url: str) -> Dict[str, Any]:
     """
     Download XiaoYuZhou podcast audio files and save to specified directory (LOCAL EXECUTION).
@@ -103,43 +137,8 @@ async def download_xyz_podcast_tool(url: str) -> Dict[str, Any]:
             - "audio_file_path" (str|None): Complete MP3 file path when successful, None when failed
             - "error_message" (str): Only exists when failed, contains specific error description
     """
-    try:
-        print(f"🏠 Downloading XiaoYuZhou Podcast locally: {url}")
-        service = get_podcast_download_service()
-        
-        # Use local download service
-        result = await service.download_podcast(
-            url=url,
-            output_folder="downloads",
-            convert_to_mp3=True,
-            keep_original=False
-        )
-        
-        if result.success:
-            return {
-                "status": "success",
-                "original_url": url,
-                "audio_file_path": result.file_path,
-                "podcast_info": {
-                    "title": result.podcast_info.title if result.podcast_info else "Unknown",
-                    "platform": "XiaoYuZhou"
-                }
-            }
-        else:
-            return {
-                "status": "failed",
-                "original_url": url,
-                "audio_file_path": None,
-                "error_message": result.error_message
-            }
-        
-    except Exception as e:
-        return {
-            "status": "failed",
-            "original_url": url,
-            "audio_file_path": None,
-            "error_message": f"Local download tool error: {str(e)}"
-        }
+    logger.debug("Downloading XiaoYuZhou Podcast locally: %s", url)
+    return await _download_podcast(get_podcast_download_service(), url, "XiaoYuZhou")
 
 
 async def get_mp3_files_tool(directory: str) -> Dict[str, Any]:
@@ -188,6 +187,33 @@ async def get_file_info_tool(file_path: str) -> Dict[str, Any]:
         }
 
 
+async def get_file_info_batch_tool(file_paths: List[str]) -> List[Dict[str, Any]]:
+    """
+    Get basic file information for several files at once (LOCAL EXECUTION).
+    
+    Args:
+        file_paths: File paths to query
+    
+    Returns:
+        One file information dictionary per path, in input order
+    """
+    service = get_file_management_service()
+    results = await asyncio.gather(
+        *(service.get_file_info(file_path) for file_path in file_paths),
+        return_exceptions=True
+    )
+    
+    return [
+        {
+            "status": "failed",
+            "file_path": file_path,
+            "file_exists": False,
+            "error_message": f"Local file info tool error: {str(result)}"
+        } if isinstance(result, Exception) else result
+        for file_path, result in zip(file_paths, results)
+    ]
+
+
 async def read_text_file_segments_tool(
     file_path: str,
     chunk_size: int = 65536,
@@ -2,16 +2,81 @@
 MCP Tools using the new service architecture
 """
 
-from typing import Dict, Any
+import importlib
+import sys
+from functools import cache
+from typing import Dict, Any, List
 
-from .transcription_tools import transcribe_audio_file_tool
-from .download_tools import (
-    download_apple_podcast_tool,
-    download_xyz_podcast_tool,
-    get_mp3_files_tool,
-    get_file_info_tool,
-    read_text_file_segments_tool
-)
+# Tool index: handler location plus the short description advertised to MCP clients.
+# Handler modules are imported on first dispatch, so the transcription and download
+# service graphs load only when one of their tools is first called
+TOOL_REGISTRY: Dict[str, Dict[str, str]] = {
+    "transcribe_audio_file": {
+        "module": ".transcription_tools",
+        "attr": "transcribe_audio_file_tool",
+        "description": "Transcribe audio files to text using Whisper model with speaker diarization support"
+    },
+    "transcribe_audio_files": {
+        "module": ".transcription_tools",
+        "attr": "transcribe_audio_files_tool",
+        "description": "Transcribe several audio files concurrently in one call"
+    },
+    "download_apple_podcast": {
+        "module": ".download_tools",
+        "attr": "download_apple_podcast_tool",
+        "description": "Download Apple Podcast audio files"
+    },
+    "download_apple_podcasts": {
+        "module": ".download_tools",
+        "attr": "download_apple_podcast_batch_tool",
+        "description": "Download several Apple Podcast audio files in one call"
+    },
+    "download_xyz_podcast": {
+        "module": ".download_tools",
+        "attr": "download_xyz_podcast_tool",
+        "description": "Download XiaoYuZhou podcast audio files"
+    },
+    "get_mp3_files": {
+        "module": ".download_tools",
+        "attr": "get_mp3_files_tool",
+        "description": "Scan directory for MP3 audio files"
+    },
+    "get_file_info": {
+        "module": ".download_tools",
+        "attr": "get_file_info_tool",
+        "description": "Get basic file information"
+    },
+    "get_file_info_batch": {
+        "module": ".download_tools",
+        "attr": "get_file_info_batch_tool",
+        "description": "Get basic file information for several files in one call"
+    },
+    "read_text_file_segments": {
+        "module": ".download_tools",
+        "attr": "read_text_file_segments_tool",
+        "description": "Read text file content in segments"
+    },
+}
+
+
+@cache
+def _load_tool(name: str):
+    """Import a registered tool handler once"""
+    entry = TOOL_REGISTRY[name]
+    module = importlib.import_module(entry["module"], __package__)
+    return getattr(module, entry["attr"])
+
+
+async def dispatch(name: str, **kwargs) -> Dict[str, Any]:
+    """Run a registered tool by name, importing its handler on first use"""
+    return await _load_tool(name)(**kwargs)
+
+
+async def shutdown() -> None:
+    """Release resources held by tool modules that have been loaded"""
+    transcription_tools = sys.modules.get(f"{__package__}.transcription_tools")
+    if transcription_tools is not None:
+        await transcription_tools.close_modal_transcription_service()
 
 
 # ==================== Transcription Tools ====================
@@ -21,7 +86,9 @@ async def transcribe_audio_file(
     model_size: str = "turbo",
     language: str = None,
     output_format: str = "srt",
-    enable_speaker_diarization: bool = False
+    enable_speaker_diarization: bool = False,
+    save_debug_json: bool = False,
+    output_formats: List[str] = None
 ) -> Dict[str, Any]:
     """
     Transcribe audio files to text using Whisper model with new service architecture
@@ -32,15 +99,53 @@ async def transcribe_audio_file(
         language: Audio language code (e.g. "zh" for Chinese, "en" for English)
         output_format: Output format (srt, txt, json)
         enable_speaker_diarization: Whether to enable speaker identification
+        save_debug_json: Whether to also save the full result as JSON when it was not the requested format
+        output_formats: Exact files to write (srt, txt, json); None derives them from output_format
     
     Returns:
         Transcription result dictionary with file paths and metadata
     """
-    return await transcribe_audio_file_tool(
+    return await dispatch(
+        "transcribe_audio_file",
         audio_file_path=audio_file_path,
         model_size=model_size,
         language=language,
         output_format=output_format,
+        enable_speaker_diarization=enable_speaker_diarization,
+        save_debug_json=save_debug_json,
+        output_formats=output_formats
+    )
+
+
+async def transcribe_audio_files(
+    audio_file_paths: List[str],
+    model_size: str = "turbo",
+    language: str = None,
+    output_format: str = "srt",
+    enable_speaker_diarization: bool = False,
+    max_concurrent: int = 5
+) -> List[Dict[str, Any]]:
+    """
+    Transcribe several audio files concurrently with new service architecture
+    
+    Args:
+        audio_file_paths: Complete paths to audio files
+        model_size: Whisper model size (tiny, base, small, medium, large, turbo)
+        language: Audio language code (e.g. "zh" for Chinese, "en" for English)
+        output_format: Output format (srt, txt, json)
+        enable_speaker_diarization: Whether to enable speaker identification
+        max_concurrent: Maximum number of files transcribed at the same time
+    
+    Returns:
+        List of transcription result dictionaries, one per path in input order
+    """
+    return await dispatch(
+        "transcribe_audio_files",
+        audio_file_paths=audio_file_paths,
+        max_concurrent=max_concurrent,
+        model_size=model_size,
+        language=language,
+        output_format=output_format,
         enable_speaker_diarization=enable_speaker_diarization
     )
 
@@ -57,7 +162,21 @@ async def download_apple_podcast(url: str) -> Dict[str, Any]:
     Returns:
         Download result dictionary with file path and metadata
     """
-    return await download_apple_podcast_tool(url)
+    return await dispatch("download_apple_podcast", url=url)
+
+
+async def download_apple_podcasts(urls: List[str], max_concurrent: int = 3) -> List[Dict[str, Any]]:
+    """
+    Download several Apple Podcast episodes in one call, sharing one download service
+    
+    Args:
+        urls: Complete URLs of Apple Podcast pages
+        max_concurrent: Maximum number of episodes downloaded at the same time
+    
+    Returns:
+        List of download result dictionaries, one per URL in input order
+    """
+    return await dispatch("download_apple_podcasts", urls=urls, max_concurrent=max_concurrent)
 
 
 async def download_xyz_podcast(url: str) -> Dict[str, Any]:
@@ -70,7 +189,7 @@ async def download_xyz_podcast(url: str) -> Dict[str, Any]:
     Returns:
         Download result dictionary with file path and metadata
     """
-    return await download_xyz_podcast_tool(url)
+    return await dispatch("download_xyz_podcast", url=url)
 
 
 # ==================== File Management Tools ====================
@@ -85,7 +204,7 @@ async def get_mp3_files(directory: str) -> Dict[str, Any]:
     Returns:
         MP3 file information dictionary with detailed file list
     """
-    return await get_mp3_files_tool(directory)
+    return await dispatch("get_mp3_files", directory=directory)
 
 
 async def get_file_info(file_path: str) -> Dict[str, Any]:
@@ -98,7 +217,20 @@ async def get_file_info(file_path: str) -> Dict[str, Any]:
     Returns:
         File information dictionary with detailed metadata
     """
-    return await get_file_info_tool(file_path)
+    return await dispatch("get_file_info", file_path=file_path)
+
+
+async def get_file_info_batch(file_paths: List[str]) -> List[Dict[str, Any]]:
+    """
+    Get basic file information for several files in one call
+    
+    Args:
+        file_paths: File paths to query
+    
+    Returns:
+        List of file information dictionaries, one per path in input order
+    """
+    return await dispatch("get_file_info_batch", file_paths=file_paths)
 
 
 async def read_text_file_segments(
@@ -117,7 +249,8 @@ async def read_text_file_segments(
     Returns:
         Read result dictionary with content and metadata
     """
-    return await read_text_file_segments_tool(
+    return await dispatch(
+        "read_text_file_segments",
         file_path=file_path,
         chunk_size=chunk_size,
         start_position=start_position
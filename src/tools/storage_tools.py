@@ -3,10 +3,71 @@ Storage Management Tools
 Provides tools for managing download and transcript storage
 """
 
+import asyncio
+import logging
+from dataclasses import dataclass
 from typing import Dict, Any, List
 from pathlib import Path
 
-from ..utils.storage_config import get_storage_config
+from ..utils.storage_config import TRANSCRIPT_FORMATS, get_storage_config
+
+logger = logging.getLogger(__name__)
+
+_INV_MB = 1.0 / (1024 * 1024)
+_INV_KB = 1.0 / 1024
+
+
+@dataclass(slots=True, frozen=True)
+class FileEntry:
+    """Audio file listing entry"""
+    filename: str
+    path: str
+    size_mb: float
+    modified: float
+    has_txt: bool
+    has_srt: bool
+    has_json: bool
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "filename": self.filename,
+            "path": self.path,
+            "size_mb": self.size_mb,
+            "modified": self.modified,
+            "has_transcripts": {'txt': self.has_txt, 'srt': self.has_srt, 'json': self.has_json},
+            "transcript_count": self.has_txt + self.has_srt + self.has_json
+        }
+
+
+@dataclass(slots=True, frozen=True)
+class TranscriptEntry:
+    """Transcript file listing entry"""
+    filename: str
+    path: str
+    size_kb: float
+    modified: float
+    base_name: str
+    has_audio: bool
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "filename": self.filename,
+            "path": self.path,
+            "size_kb": self.size_kb,
+            "modified": self.modified,
+            "base_name": self.base_name,
+            "has_audio": self.has_audio
+        }
+
+
+def _mb(size_bytes: int) -> float:
+    """Size in MB to two decimals, rounding halves up"""
+    return int(size_bytes * _INV_MB * 100 + 0.5) / 100
+
+
+def _kb(size_bytes: int) -> float:
+    """Size in KB to two decimals, rounding halves up"""
+    return int(size_bytes * _INV_KB * 100 + 0.5) / 100
 
 
 async def get_storage_info_tool() -> Dict[str, Any]:
@@ -18,12 +79,12 @@ async def get_storage_info_tool() -> Dict[str, Any]:
     """
     try:
         storage_config = get_storage_config()
-        storage_info = storage_config.get_storage_info()
+        storage_info = await asyncio.to_thread(storage_config.get_storage_info)
         
-        print(f"📊 Storage Information:")
-        print(f"   Downloads: {storage_info['downloads_dir']}")
-        print(f"   Transcripts: {storage_info['transcripts_dir']}")
-        print(f"   Cache: {storage_info['cache_dir']}")
+        logger.debug(
+            "Storage info: downloads=%s transcripts=%s cache=%s",
+            storage_info['downloads_dir'], storage_info['transcripts_dir'], storage_info['cache_dir']
+        )
         
         return {"status": "success", **storage_info}
         
@@ -40,41 +101,40 @@ async def list_audio_files_tool() -> Dict[str, Any]:
     """
     try:
         storage_config = get_storage_config()
-        audio_files = storage_config.get_audio_files()
+        # Both directory scans block, so they run concurrently off the event loop
+        audio_files, transcript_index = await asyncio.gather(
+            asyncio.to_thread(storage_config.scan_audio_files),
+            asyncio.to_thread(storage_config.get_transcript_index)
+        )
         
         file_list = []
         total_size = 0
         
-        for audio_file in audio_files:
-            file_size = audio_file.stat().st_size
+        for audio_file, file_stat in audio_files:
+            file_size = file_stat.st_size
             total_size += file_size
             
             # Check for corresponding transcript files
-            transcript_files = storage_config.get_transcript_files(audio_file.name)
-            has_transcripts = {
-                'txt': transcript_files['txt'].exists(),
-                'srt': transcript_files['srt'].exists(),
-                'json': transcript_files['json'].exists()
-            }
+            transcripts = transcript_index.get(audio_file.stem, {})
             
-            file_info = {
-                "filename": audio_file.name,
-                "path": str(audio_file),
-                "size_mb": round(file_size / (1024 * 1024), 2),
-                "modified": audio_file.stat().st_mtime,
-                "has_transcripts": has_transcripts,
-                "transcript_count": sum(has_transcripts.values())
-            }
-            file_list.append(file_info)
+            file_list.append(FileEntry(
+                filename=audio_file.name,
+                path=str(audio_file),
+                size_mb=_mb(file_size),
+                modified=file_stat.st_mtime,
+                has_txt='txt' in transcripts,
+                has_srt='srt' in transcripts,
+                has_json='json' in transcripts
+            ))
         
-        print(f"📁 Found {len(audio_files)} audio files ({round(total_size / (1024 * 1024), 2)} MB total)")
+        logger.debug("Found %d audio files (%d bytes total)", len(audio_files), total_size)
         
         return {
             "status": "success",
             "audio_files_count": len(audio_files),
-            "total_size_mb": round(total_size / (1024 * 1024), 2),
+            "total_size_mb": _mb(total_size),
             "downloads_directory": str(storage_config.downloads_dir),
-            "audio_files": file_list
+            "audio_files": [entry.to_dict() for entry in file_list]
         }
         
     except Exception as e:
@@ -93,7 +153,11 @@ async def list_transcript_files_tool() -> Dict[str, Any]:
     """
     try:
         storage_config = get_storage_config()
-        transcript_files = storage_config.get_transcript_files()
+        transcript_files, audio_files = await asyncio.gather(
+            asyncio.to_thread(storage_config.scan_transcript_files),
+            asyncio.to_thread(storage_config.get_audio_files)
+        )
+        audio_stems = frozenset(audio_file.stem for audio_file in audio_files)
         
         organized_files = {}
         total_files = 0
@@ -103,39 +167,36 @@ async def list_transcript_files_tool() -> Dict[str, Any]:
             format_info = []
             format_size = 0
             
-            for transcript_file in files:
-                file_size = transcript_file.stat().st_size
+            for transcript_file, file_stat in files:
+                file_size = file_stat.st_size
                 format_size += file_size
                 total_size += file_size
                 
                 # Check if corresponding audio file exists
                 base_name = transcript_file.stem
-                audio_files = storage_config.get_audio_files()
-                has_audio = any(af.stem == base_name for af in audio_files)
                 
-                file_info = {
-                    "filename": transcript_file.name,
-                    "path": str(transcript_file),
-                    "size_kb": round(file_size / 1024, 2),
-                    "modified": transcript_file.stat().st_mtime,
-                    "base_name": base_name,
-                    "has_audio": has_audio
-                }
-                format_info.append(file_info)
+                format_info.append(TranscriptEntry(
+                    filename=transcript_file.name,
+                    path=str(transcript_file),
+                    size_kb=_kb(file_size),
+                    modified=file_stat.st_mtime,
+                    base_name=base_name,
+                    has_audio=base_name in audio_stems
+                ))
             
             organized_files[format_type] = {
                 "count": len(files),
-                "size_kb": round(format_size / 1024, 2),
-                "files": format_info
+                "size_kb": _kb(format_size),
+                "files": [entry.to_dict() for entry in format_info]
             }
             total_files += len(files)
         
-        print(f"📄 Found {total_files} transcript files ({round(total_size / 1024, 2)} KB total)")
+        logger.debug("Found %d transcript files (%d bytes total)", total_files, total_size)
         
         return {
             "status": "success",
             "total_files": total_files,
-            "total_size_kb": round(total_size / 1024, 2),
+            "total_size_kb": _kb(total_size),
             "transcripts_directory": str(storage_config.transcripts_dir),
             "formats": organized_files
         }
@@ -160,23 +221,18 @@ async def cleanup_cache_tool(pattern: str = "temp_*") -> Dict[str, Any]:
     try:
         storage_config = get_storage_config()
         
-        # Get cache size before cleanup
-        cache_info_before = storage_config.get_storage_info()
-        cache_size_before = cache_info_before['cache_size_mb']
+        # Cleanup reports what it freed, so only the remaining cache is measured
+        bytes_freed, files_removed = await asyncio.to_thread(storage_config.cleanup_temp_files, pattern)
+        cache_bytes_after = await asyncio.to_thread(storage_config.get_cache_size)
         
-        # Perform cleanup
-        storage_config.cleanup_temp_files(pattern)
+        cache_size_before = _mb(cache_bytes_after + bytes_freed)
+        cache_size_after = _mb(cache_bytes_after)
+        cleaned_mb = _mb(bytes_freed)
         
-        # Get cache size after cleanup
-        cache_info_after = storage_config.get_storage_info()
-        cache_size_after = cache_info_after['cache_size_mb']
-        
-        cleaned_mb = cache_size_before - cache_size_after
-        
-        print(f"🗑️ Cache cleanup completed")
-        print(f"   Pattern: {pattern}")
-        print(f"   Cleaned: {cleaned_mb:.2f} MB")
-        print(f"   Cache size: {cache_size_before:.2f} MB → {cache_size_after:.2f} MB")
+        logger.debug(
+            "Cache cleanup completed: pattern=%s removed=%d files cleaned=%.2f MB size=%.2f MB -> %.2f MB",
+            pattern, files_removed, cleaned_mb, cache_size_before, cache_size_after
+        )
         
         return {
             "status": "success",
@@ -184,7 +240,8 @@ async def cleanup_cache_tool(pattern: str = "temp_*") -> Dict[str, Any]:
             "cache_directory": str(storage_config.cache_dir),
             "size_before_mb": cache_size_before,
             "size_after_mb": cache_size_after,
-            "cleaned_mb": cleaned_mb
+            "cleaned_mb": cleaned_mb,
+            "files_removed": files_removed
         }
         
     except Exception as e:
@@ -217,17 +274,25 @@ async def check_transcript_status_tool(audio_filename: str = None) -> Dict[str,
                 }
             
             transcript_files = storage_config.get_transcript_files(audio_filename)
+            transcripts = {}
+            for format_type, file_path in transcript_files.items():
+                # One stat per format answers both existence and size
+                try:
+                    file_size = file_path.stat().st_size
+                    exists = True
+                except FileNotFoundError:
+                    file_size = 0
+                    exists = False
+                transcripts[format_type] = {
+                    "exists": exists,
+                    "path": str(file_path),
+                    "size_kb": _kb(file_size) if exists else 0
+                }
+            
             status = {
                 "audio_file": audio_filename,
                 "audio_exists": True,
-                "transcripts": {
-                    format_type: {
-                        "exists": file_path.exists(),
-                        "path": str(file_path),
-                        "size_kb": round(file_path.stat().st_size / 1024, 2) if file_path.exists() else 0
-                    }
-                    for format_type, file_path in transcript_files.items()
-                }
+                "transcripts": transcripts
             }
             
             return {
@@ -237,7 +302,10 @@ async def check_transcript_status_tool(audio_filename: str = None) -> Dict[str,
             }
         else:
             # Check all audio files
-            audio_files = storage_config.get_audio_files()
+            audio_files, transcript_index = await asyncio.gather(
+                asyncio.to_thread(storage_config.get_audio_files),
+                asyncio.to_thread(storage_config.get_transcript_index)
+            )
             statuses = []
             
             summary = {
@@ -248,9 +316,9 @@ async def check_transcript_status_tool(audio_filename: str = None) -> Dict[str,
             }
             
             for audio_file in audio_files:
-                transcript_files = storage_config.get_transcript_files(audio_file.name)
+                transcripts = transcript_index.get(audio_file.stem, {})
                 
-                has_any_transcript = any(tf.exists() for tf in transcript_files.values())
+                has_any_transcript = bool(transcripts)
                 if has_any_transcript:
                     summary["files_with_transcripts"] += 1
                 else:
@@ -260,23 +328,24 @@ async def check_transcript_status_tool(audio_filename: str = None) -> Dict[str,
                     "audio_file": audio_file.name,
                     "has_transcripts": has_any_transcript,
                     "transcript_formats": {
-                        format_type: file_path.exists()
-                        for format_type, file_path in transcript_files.items()
+                        format_type: format_type in transcripts
+                        for format_type in TRANSCRIPT_FORMATS
                     }
                 }
                 
-                # Count transcript formats
-                for format_type, exists in file_status["transcript_formats"].items():
-                    if exists:
-                        summary["transcript_formats"][format_type] += 1
+                # Count transcript formats; the index only holds formats that exist
+                for format_type in transcripts:
+                    summary["transcript_formats"][format_type] += 1
                 
                 statuses.append(file_status)
             
-            print(f"📊 Transcript Status Summary:")
-            print(f"   Total audio files: {summary['total_audio_files']}")
-            print(f"   With transcripts: {summary['files_with_transcripts']}")
-            print(f"   Without transcripts: {summary['files_without_transcripts']}")
-            print(f"   Format counts: TXT({summary['transcript_formats']['txt']}) SRT({summary['transcript_formats']['srt']}) JSON({summary['transcript_formats']['json']})")
+            logger.debug(
+                "Transcript status: total=%d with=%d without=%d formats=%s",
+                summary['total_audio_files'],
+                summary['files_with_transcripts'],
+                summary['files_without_transcripts'],
+                summary['transcript_formats']
+            )
             
             return {
                 "status": "success",
@@ -4,32 +4,155 @@ Updated to use ModalTranscriptionService for better separation of concerns
 """
 
 import asyncio
-from typing import Dict, Any
+import atexit
+import json
+import logging
+import mmap
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache
+from typing import Dict, Any, List, Optional
+
+import numpy as np
 
 from ..services import ModalTranscriptionService
+from ..utils.storage_config import get_storage_config
+
+# Optional fast JSON codec for the full transcription result dump
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
+logger = logging.getLogger(__name__)
 
-# Global service instance for reuse
+# Global service instance for reuse; the lock keeps concurrent cold starts from
+# each constructing their own service
 _modal_transcription_service = None
+_service_lock = threading.Lock()
+
+# Dedicated pool for transcript file writes so large dumps don't queue other
+# blocking calls (health checks, Modal RPC helpers) on the default executor
+_IO_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="transcript-io")
+atexit.register(_IO_POOL.shutdown, wait=True)
+
+
+# Payloads above this size are written through mmap; below it the mapping setup
+# costs more than a plain write
+MMAP_WRITE_THRESHOLD = 1_000_000
+
+# One SRT cue: index, start --> end, text, blank separator line
+_SRT_BLOCK_TEMPLATE = "%d\n%s --> %s\n%s\n\n"
 
 
 def _format_srt_time(seconds: float) -> str:
     """Format seconds to SRT time format (HH:MM:SS,mmm)"""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    millisecs = int((seconds % 1) * 1000)
-    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millisecs:03d}"
+    ms = int(seconds * 1000)
+    hours, ms = divmod(ms, 3_600_000)
+    minutes, ms = divmod(ms, 60_000)
+    secs, ms = divmod(ms, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d},{ms:03d}"
+
+
+def _format_srt_times(seconds) -> List[str]:
+    """Format a sequence of seconds to SRT times, doing the arithmetic on whole arrays"""
+    ms = (np.asarray(seconds, dtype=np.float64) * 1000).astype(np.int64)
+    hours, ms = np.divmod(ms, 3_600_000)
+    minutes, ms = np.divmod(ms, 60_000)
+    secs, ms = np.divmod(ms, 1000)
+    return [
+        f"{h:02d}:{m:02d}:{s:02d},{x:03d}"
+        for h, m, s, x in zip(hours.tolist(), minutes.tolist(), secs.tolist(), ms.tolist())
+    ]
+
+
+def _write_bytes(path, payload: bytes) -> None:
+    """Write a whole payload with raw os.write calls, bypassing the buffered io stack"""
+    if len(payload) > MMAP_WRITE_THRESHOLD:
+        # Copy into a mapping of the pre-sized file; the kernel writes the pages back
+        # lazily instead of close() waiting on a large write
+        with open(path, 'w+b') as f:
+            f.truncate(len(payload))
+            with mmap.mmap(f.fileno(), len(payload)) as mapped:
+                mapped[:] = payload
+        return
+    
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def _write_text(path, data: str) -> None:
+    """Write a text file as UTF-8"""
+    _write_bytes(path, data.encode('utf-8'))
+
+
+def _dump_json_bytes(obj: Any) -> bytes:
+    """Encode one value as compact UTF-8 JSON"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+def _write_json(path, obj: Dict[str, Any]) -> None:
+    """
+    Write an object as UTF-8 JSON. A segments list is streamed one segment per line,
+    so only a single encoded segment is held in memory at a time
+    """
+    segments = obj.get("segments")
+    if not isinstance(segments, list) or not segments:
+        if ORJSON_AVAILABLE:
+            _write_bytes(path, orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(obj, f, indent=2, ensure_ascii=False)
+        return
+    
+    header = {key: value for key, value in obj.items() if key != "segments"}
+    # Buffered writes on purpose: the mmap path in _write_bytes needs the total size
+    # up front, which would mean encoding every segment in memory before writing
+    with open(path, 'wb') as f:
+        if header:
+            f.write(_dump_json_bytes(header)[:-1])
+            f.write(b',\n"segments":[\n')
+        else:
+            f.write(b'{"segments":[\n')
+        for i, segment in enumerate(segments):
+            if i:
+                f.write(b',\n')
+            f.write(_dump_json_bytes(segment))
+        f.write(b'\n]}\n')
+
+
+@cache
+def _output_dir() -> str:
+    """Transcripts directory from the global storage config, resolved once"""
+    return str(get_storage_config().transcripts_dir)
 
 
 def get_modal_transcription_service() -> ModalTranscriptionService:
     """Get or create global ModalTranscriptionService instance"""
     global _modal_transcription_service
     if _modal_transcription_service is None:
-        _modal_transcription_service = ModalTranscriptionService(use_direct_modal_calls=True)
+        with _service_lock:
+            if _modal_transcription_service is None:
+                _modal_transcription_service = ModalTranscriptionService(use_direct_modal_calls=True)
     return _modal_transcription_service
 
 
+async def close_modal_transcription_service() -> None:
+    """Close the global service's HTTP session, if the service was created"""
+    if _modal_transcription_service is not None:
+        await _modal_transcription_service.close()
+
+
 async def transcribe_audio_file_tool(
     audio_file_path: str,
     model_size: str = "turbo",  # Default to turbo model
@@ -38,7 +161,9 @@ async def transcribe_audio_file_tool(
     enable_speaker_diarization: bool = False,
     use_parallel_processing: bool = True,  # Enable parallel processing by default
     chunk_duration: int = 60,  # 60 seconds chunks for parallel processing
-    use_intelligent_segmentation: bool = True  # Enable intelligent segmentation by default
+    use_intelligent_segmentation: bool = True,  # Enable intelligent segmentation by default
+    save_debug_json: bool = False,
+    output_formats: Optional[List[str]] = None
 ) -> Dict[str, Any]:
     """
     MCP tool function for audio transcription using Modal endpoints with intelligent processing
@@ -48,19 +173,21 @@ async def transcribe_audio_file_tool(
         audio_file_path: Path to audio file
         model_size: Whisper model size (tiny, base, small, medium, large, turbo)
         language: Language code (e.g., 'en', 'zh', None for auto-detect)
-        output_format: Output format (srt, txt, json)
+        output_format: Output format (srt, txt, json); the SRT file is only built for "srt",
+            the TXT file is written whenever text is available
         enable_speaker_diarization: Whether to enable speaker diarization
         use_parallel_processing: Whether to use distributed processing for long audio
         chunk_duration: Duration of each chunk in seconds for parallel processing
         use_intelligent_segmentation: Whether to use intelligent silence-based segmentation
+        save_debug_json: Whether to also save the full result as JSON when the
+            transcription succeeded and JSON was not the requested format
+        output_formats: Exact set of files to write (any of srt, txt, json); None keeps
+            the output_format based selection. A failed run always saves its JSON
         
     Returns:
         Transcription result dictionary with local file paths
     """
     try:
-        import os
-        import pathlib
-        
         service = get_modal_transcription_service()
         modal_result = await service.transcribe_audio_file(
             audio_file_path=audio_file_path,
@@ -77,78 +204,106 @@ async def transcribe_audio_file_tool(
         # if modal_result.get("processing_status") != "success":
         #     return modal_result
         
-        # Debug: Print modal result structure
-        print(f"🔍 Modal result keys: {list(modal_result.keys())}")
-        print(f"🔍 Has text: {bool(modal_result.get('text'))}")
-        print(f"🔍 Has segments: {bool(modal_result.get('segments'))}")
-        if modal_result.get("segments"):
-            print(f"🔍 Segments count: {len(modal_result['segments'])}")
+        # Debug: Log modal result structure
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Modal result keys=%s has_text=%s segments=%d",
+                list(modal_result), bool(modal_result.get("text")), len(modal_result.get("segments") or ())
+            )
         
         # Save transcription results to local files using storage config
-        from ..utils.storage_config import get_storage_config
-        storage_config = get_storage_config()
+        # Plain string path ops; pathlib would build a new Path for every join
+        base_path = os.path.join(_output_dir(), os.path.splitext(os.path.basename(audio_file_path))[0])
         
-        base_name = pathlib.Path(audio_file_path).stem
-        output_dir = storage_config.transcripts_dir
+        if output_formats is None:
+            write_srt = output_format == "srt"
+            write_txt = True
+            write_json = output_format == "json"
+        else:
+            write_srt = "srt" in output_formats
+            write_txt = "txt" in output_formats
+            write_json = "json" in output_formats
         
         saved_files = []
+        writes = []
+        loop = asyncio.get_running_loop()
         txt_file_path = None
         srt_file_path = None
         json_file_path = None
         
-        # Generate SRT content if segments are available
-        if modal_result.get("segments"):
-            segments = modal_result["segments"]
+        # Generate SRT content only when SRT was requested and segments are available
+        if write_srt and modal_result.get("segments"):
+            # Drop empty segments up front so the join below only formats kept blocks
+            kept_segments = []
+            # Few distinct speakers, so each "[speaker] " prefix is built once
+            speaker_prefixes = {}
+            append = kept_segments.append
+            for segment in modal_result["segments"]:
+                get = segment.get
+                text = get("text", "").strip()
+                if not text:
+                    continue
+                if enable_speaker_diarization:
+                    speaker = get("speaker")
+                    if speaker:
+                        prefix = speaker_prefixes.get(speaker)
+                        if prefix is None:
+                            prefix = speaker_prefixes[speaker] = f"[{speaker}] "
+                        text = prefix + text
+                append((get("start", 0), get("end", 0), text))
+            
             srt_content = ""
-            for i, segment in enumerate(segments, 1):
-                start_time = _format_srt_time(segment.get("start", 0))
-                end_time = _format_srt_time(segment.get("end", 0))
-                text = segment.get("text", "").strip()
-                
-                if text:
-                    if enable_speaker_diarization and segment.get("speaker"):
-                        text = f"[{segment['speaker']}] {text}"
-                    
-                    srt_content += f"{i}\n{start_time} --> {end_time}\n{text}\n\n"
+            if kept_segments:
+                starts, ends, texts = zip(*kept_segments)
+                # Join once; repeated += copies the whole string each time
+                srt_content = "".join(
+                    _SRT_BLOCK_TEMPLATE % (i, start, end, text)
+                    for i, (start, end, text) in enumerate(
+                        zip(_format_srt_times(starts), _format_srt_times(ends), texts), 1
+                    )
+                )
             
             if srt_content:
-                srt_file_path = output_dir / f"{base_name}.srt"
-                with open(srt_file_path, 'w', encoding='utf-8') as f:
-                    f.write(srt_content)
-                saved_files.append(str(srt_file_path))
-                print(f"💾 Saved SRT file: {srt_file_path}")
-        
-        # Generate TXT content if text is available
-        if modal_result.get("text"):
-            txt_file_path = output_dir / f"{base_name}.txt"
-            with open(txt_file_path, 'w', encoding='utf-8') as f:
-                f.write(modal_result["text"])
-            saved_files.append(str(txt_file_path))
-            print(f"💾 Saved TXT file: {txt_file_path}")
-        
-        # Save JSON file with full results (always save for debugging)
-        import json
-        json_file_path = output_dir / f"{base_name}.json"
-        with open(json_file_path, 'w', encoding='utf-8') as f:
-            json.dump(modal_result, f, indent=2, ensure_ascii=False)
-        saved_files.append(str(json_file_path))
-        print(f"💾 Saved JSON file: {json_file_path}")
+                srt_file_path = base_path + ".srt"
+                writes.append(loop.run_in_executor(_IO_POOL, _write_text, srt_file_path, srt_content))
+                saved_files.append(srt_file_path)
+        
+        # Generate TXT content if requested and text is available
+        if write_txt and modal_result.get("text"):
+            txt_file_path = base_path + ".txt"
+            writes.append(loop.run_in_executor(_IO_POOL, _write_text, txt_file_path, modal_result["text"]))
+            saved_files.append(txt_file_path)
+        
+        # Save JSON file with full results when requested or for debugging a failed run;
+        # it duplicates the segments and is the largest artifact on the happy path
+        if (
+            save_debug_json
+            or write_json
+            or modal_result.get("processing_status") != "success"
+        ):
+            json_file_path = base_path + ".json"
+            writes.append(loop.run_in_executor(_IO_POOL, _write_json, json_file_path, modal_result))
+            saved_files.append(json_file_path)
+        
+        # Only the selected files are written; the writes block, so they run together
+        # on the I/O pool off the event loop
+        await asyncio.gather(*writes)
+        logger.debug("Saved transcript files: %s", saved_files)
         
         # Warn if no text/segments found
         if not modal_result.get("segments") and not modal_result.get("text"):
-            print("⚠️ Warning: No text or segments found in transcription result")
-        
-        # Update result with local file paths
-        result = {}
-        result["txt_file_path"] = str(txt_file_path) if txt_file_path else None
-        result["srt_file_path"] = str(srt_file_path) if srt_file_path else None
-        result["json_file_path"] = str(json_file_path) if json_file_path else None
-        result["saved_files"] = saved_files
-        result["local_files_saved"] = len(saved_files)
+            logger.warning("No text or segments found in transcription result")
         
-        print(f"✅ Transcription completed and saved {len(saved_files)} local files")
+        logger.info("Transcription completed and saved %d local files", len(saved_files))
         
-        return result
+        # Result with local file paths, built in one literal
+        return {
+            "txt_file_path": txt_file_path,
+            "srt_file_path": srt_file_path,
+            "json_file_path": json_file_path,
+            "saved_files": saved_files,
+            "local_files_saved": len(saved_files)
+        }
         
     except Exception as e:
         return {
@@ -157,6 +312,43 @@ async def transcribe_audio_file_tool(
         }
 
 
+async def transcribe_audio_files_tool(
+    audio_file_paths: List[str],
+    max_concurrent: int = 5,
+    **kwargs
+) -> List[Dict[str, Any]]:
+    """
+    Transcribe several audio files, keeping up to max_concurrent transcriptions in flight
+    
+    Args:
+        audio_file_paths: Paths to audio files
+        max_concurrent: Maximum number of files transcribed at the same time
+        **kwargs: Options passed to transcribe_audio_file_tool for every file
+        
+    Returns:
+        One transcription result dictionary per path, in input order
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrent))
+    
+    async def run(audio_file_path: str) -> Dict[str, Any]:
+        async with semaphore:
+            return await transcribe_audio_file_tool(audio_file_path, **kwargs)
+    
+    results = await asyncio.gather(
+        *(run(audio_file_path) for audio_file_path in audio_file_paths),
+        return_exceptions=True
+    )
+    
+    return [
+        {
+            "processing_status": "failed",
+            "audio_file_path": audio_file_path,
+            "error_message": f"Tool error: {str(result)}"
+        } if isinstance(result, Exception) else result
+        for audio_file_path, result in zip(audio_file_paths, results)
+    ]
+
+
 async def check_modal_endpoints_health() -> Dict[str, Any]:
     """
     Check the health status of Modal endpoints
@@ -6,9 +6,9 @@ Contains all UI components and interface logic
 import gradio as gr
 import asyncio
 import os
+# Callbacks go through the mcp_tools registry, so tool modules and their services
+# are imported when a tab is first used rather than when the UI is built
 from ..tools import mcp_tools
-from ..tools.download_tools import get_file_info_tool, get_mp3_files_tool, read_text_file_segments_tool
-from ..tools.transcription_tools import transcribe_audio_file_tool
 
 def write_text_file_content(file_path: str, content: str, mode: str = "w", position: int = None):
     """Simple text file writing function"""
@@ -379,7 +379,7 @@ def create_gradio_interface():
                 try:
                     # Check if file exists
                     import asyncio
-                    file_info = asyncio.run(get_file_info_tool(audio_path))
+                    file_info = asyncio.run(mcp_tools.get_file_info(audio_path))
                     if file_info["status"] != "success":
                         return {
                             "error": f"File does not exist or cannot be accessed: {file_info.get('error_message', 'Unknown error')}"
@@ -390,7 +390,7 @@ def create_gradio_interface():
                         lang = None if language == "auto" else language
                         
                         # Call transcription tool
-                        result = asyncio.run(transcribe_audio_file_tool(
+                        result = asyncio.run(mcp_tools.transcribe_audio_file(
                             audio_file_path=audio_path,
                             model_size=model_size,
                             language=lang,
@@ -500,7 +500,7 @@ def create_gradio_interface():
                     return "Please enter a directory path"
                 
                 try:
-                    result = asyncio.run(get_mp3_files_tool(directory.strip()))
+                    result = asyncio.run(mcp_tools.get_mp3_files(directory.strip()))
                     
                     # Check if there's an error
                     if "error_message" in result:
@@ -601,14 +601,19 @@ def create_gradio_interface():
                 lines=2
             )
             
-            def load_and_display_file(file_path):
+            def read_whole_text_file(path):
+                """Read a UTF-8 text file in one call through a 256 KB buffer"""
+                with open(path, 'r', encoding='utf-8', buffering=1 << 18) as f:
+                    return f.read()
+            
+            async def load_and_display_file(file_path):
                 """Load and display complete file content"""
                 if not file_path.strip():
                     return "Please enter a file path", "❌ No file path provided"
                 
                 try:
                     # Get file info first
-                    info = asyncio.run(get_file_info_tool(file_path))
+                    info = await mcp_tools.get_file_info(file_path)
                     
                     if info["status"] != "success":
                         return "", f"❌ Error: {info.get('error_message', 'Unknown error')}"
@@ -618,9 +623,8 @@ def create_gradio_interface():
                     if file_size_mb > 10:  # Warn for files larger than 10MB
                         return "", f"⚠️ File is too large ({file_size_mb:.2f} MB). Please use a smaller file for viewing."
                     
-                    # Read entire file content
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
+                    # Read entire file content in a worker thread so the event loop keeps serving
+                    content = await asyncio.to_thread(read_whole_text_file, file_path)
                     
                     # Status message
                     status = f"✅ File loaded successfully: {info.get('filename', 'Unknown')}\n📁 Size: {file_size_mb:.2f} MB"
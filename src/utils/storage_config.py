@@ -3,12 +3,25 @@ Storage Configuration Management
 Centralizes all storage path configurations for downloads and transcripts
 """
 
+import fnmatch
 import os
+import re
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 from dotenv import load_dotenv
 
 
+AUDIO_EXTENSIONS = {'.mp3', '.wav', '.m4a', '.flac', '.aac', '.ogg'}
+TRANSCRIPT_FORMATS = ('txt', 'srt', 'json')
+
+
+@lru_cache(maxsize=32)
+def _compile_pattern(pattern: str) -> re.Pattern:
+    """Compile a glob pattern to a regex once per distinct pattern"""
+    return re.compile(fnmatch.translate(pattern))
+
+
 class StorageConfig:
     """Centralized storage configuration for podcast processing"""
     
@@ -133,15 +146,66 @@ class StorageConfig:
         Returns:
             List of audio file paths
         """
-        audio_extensions = {'.mp3', '.wav', '.m4a', '.flac', '.aac', '.ogg'}
         audio_files = []
         
         for file_path in self.downloads_dir.iterdir():
-            if file_path.is_file() and file_path.suffix.lower() in audio_extensions:
+            if file_path.is_file() and file_path.suffix.lower() in AUDIO_EXTENSIONS:
                 audio_files.append(file_path)
         
         return sorted(audio_files)
     
+    def scan_audio_files(self) -> list[tuple[Path, os.stat_result]]:
+        """
+        Get all audio files in downloads directory with their stat results,
+        from a single directory scan
+        
+        Returns:
+            Sorted list of (audio file path, stat result) pairs
+        """
+        audio_files = []
+        
+        with os.scandir(self.downloads_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and os.path.splitext(entry.name)[1].lower() in AUDIO_EXTENSIONS:
+                    audio_files.append((Path(entry.path), entry.stat()))
+        
+        return sorted(audio_files, key=lambda item: item[0])
+    
+    def scan_transcript_files(self) -> dict[str, list[tuple[Path, os.stat_result]]]:
+        """
+        Get all transcript files with their stat results, from a single directory scan
+        
+        Returns:
+            Dictionary mapping format to list of (file path, stat result) pairs
+        """
+        transcript_files = {fmt: [] for fmt in TRANSCRIPT_FORMATS}
+        
+        with os.scandir(self.transcripts_dir) as entries:
+            for entry in entries:
+                ext = os.path.splitext(entry.name)[1][1:]
+                if ext in transcript_files and entry.is_file():
+                    transcript_files[ext].append((Path(entry.path), entry.stat()))
+        
+        return transcript_files
+    
+    def get_transcript_index(self) -> dict[str, dict[str, Path]]:
+        """
+        Get existing transcript files keyed by base name, so looking up the
+        transcripts of many audio files needs one directory scan in total
+        
+        Returns:
+            Dictionary mapping base name to {format: file path}
+        """
+        index = {}
+        
+        with os.scandir(self.transcripts_dir) as entries:
+            for entry in entries:
+                base_name, ext = os.path.splitext(entry.name)
+                if ext[1:] in TRANSCRIPT_FORMATS and entry.is_file():
+                    index.setdefault(base_name, {})[ext[1:]] = Path(entry.path)
+        
+        return index
+    
     def get_transcript_files(self, audio_filename: str = None) -> dict[str, Path]:
         """
         Get paths for all transcript formats for a given audio file
@@ -169,21 +233,50 @@ class StorageConfig:
                         transcript_files[ext].append(file_path)
             return transcript_files
     
-    def cleanup_temp_files(self, pattern: str = "temp_*"):
+    def cleanup_temp_files(self, pattern: str = "temp_*") -> tuple[int, int]:
         """
         Clean up temporary files in cache directory
         
         Args:
-            pattern: File pattern to match for cleanup
+            pattern: File pattern to match for cleanup; matched against names
+                directly in the cache directory, so it may not contain a path separator
+            
+        Returns:
+            Tuple of (bytes freed, files removed)
         """
-        import glob
-        temp_files = glob.glob(str(self.cache_dir / pattern))
-        for temp_file in temp_files:
-            try:
-                os.remove(temp_file)
-                print(f"🗑️ Cleaned up temp file: {temp_file}")
-            except Exception as e:
-                print(f"⚠️ Failed to cleanup {temp_file}: {e}")
+        if "/" in pattern or os.sep in pattern or (os.altsep and os.altsep in pattern):
+            raise ValueError(f"Cleanup pattern must not contain a path separator: {pattern}")
+        
+        bytes_freed = 0
+        files_removed = 0
+        if not self.cache_dir.exists():
+            return bytes_freed, files_removed
+        
+        match = _compile_pattern(pattern).match
+        # Keep glob semantics: wildcards don't match dotfiles unless the
+        # pattern itself starts with a dot
+        skip_hidden = not pattern.startswith('.')
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if skip_hidden and entry.name.startswith('.'):
+                    continue
+                if not match(entry.name) or not entry.is_file():
+                    continue
+                try:
+                    file_size = entry.stat().st_size
+                    os.unlink(entry.path)
+                    bytes_freed += file_size
+                    files_removed += 1
+                    print(f"🗑️ Cleaned up temp file: {entry.path}")
+                except FileNotFoundError:
+                    pass
+                except Exception as e:
+                    print(f"⚠️ Failed to cleanup {entry.path}: {e}")
+        return bytes_freed, files_removed
+    
+    def get_cache_size(self) -> int:
+        """Get total size of the cache directory in bytes"""
+        return _get_dir_size(self.cache_dir)
     
     def get_storage_info(self) -> dict:
         """
@@ -195,17 +288,6 @@ class StorageConfig:
         audio_files = self.get_audio_files()
         transcript_files = self.get_transcript_files()
         
-        def get_dir_size(directory: Path) -> int:
-            """Get total size of directory in bytes"""
-            total_size = 0
-            try:
-                for file_path in directory.rglob('*'):
-                    if file_path.is_file():
-                        total_size += file_path.stat().st_size
-            except Exception:
-                pass
-            return total_size
-        
         return {
             "environment": "modal" if self.is_modal_env else "local",
             "downloads_dir": str(self.downloads_dir),
@@ -215,12 +297,24 @@ class StorageConfig:
             "transcript_txt_count": len(transcript_files.get('txt', [])),
             "transcript_srt_count": len(transcript_files.get('srt', [])),
             "transcript_json_count": len(transcript_files.get('json', [])),
-            "downloads_size_mb": round(get_dir_size(self.downloads_dir) / (1024 * 1024), 2),
-            "transcripts_size_mb": round(get_dir_size(self.transcripts_dir) / (1024 * 1024), 2),
-            "cache_size_mb": round(get_dir_size(self.cache_dir) / (1024 * 1024), 2),
+            "downloads_size_mb": round(_get_dir_size(self.downloads_dir) / (1024 * 1024), 2),
+            "transcripts_size_mb": round(_get_dir_size(self.transcripts_dir) / (1024 * 1024), 2),
+            "cache_size_mb": round(_get_dir_size(self.cache_dir) / (1024 * 1024), 2),
         }
 
 
+def _get_dir_size(directory: Path) -> int:
+    """Get total size of directory in bytes"""
+    total_size = 0
+    try:
+        for file_path in directory.rglob('*'):
+            if file_path.is_file():
+                total_size += file_path.stat().st_size
+    except Exception:
+        pass
+    return total_size
+
+
 # Global storage configuration instance
 _storage_config: Optional[StorageConfig] = None
 
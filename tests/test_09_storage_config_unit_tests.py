@@ -32,10 +32,10 @@ class TestStorageConfig:
         self.config_file = self.temp_dir / "test_config.env"
         
         # Create test config file
-        config_content = """
-DOWNLOADS_DIR=./test_downloads
-TRANSCRIPTS_DIR=./test_transcripts
-CACHE_DIR=./test_cache
+        config_content = f"""
+DOWNLOADS_DIR={self.temp_dir}/test_downloads
+TRANSCRIPTS_DIR={self.temp_dir}/test_transcripts
+CACHE_DIR={self.temp_dir}/test_cache
 DEFAULT_MODEL_SIZE=base
 DEFAULT_OUTPUT_FORMAT=srt
 USE_PARALLEL_PROCESSING=true
@@ -123,10 +123,10 @@ CHUNK_DURATION=30
             test_dir.mkdir(exist_ok=True)
             
             # Create isolated config file
-            config_content = """
-DOWNLOADS_DIR=./audio_test_downloads
-TRANSCRIPTS_DIR=./audio_test_transcripts
-CACHE_DIR=./audio_test_cache
+            config_content = f"""
+DOWNLOADS_DIR={test_dir}/audio_test_downloads
+TRANSCRIPTS_DIR={test_dir}/audio_test_transcripts
+CACHE_DIR={test_dir}/audio_test_cache
 """
             with open(test_config_file, 'w') as f:
                 f.write(config_content)
@@ -174,10 +174,10 @@ CACHE_DIR=./audio_test_cache
             test_dir.mkdir(exist_ok=True)
             
             # Create isolated config file
-            config_content = """
-DOWNLOADS_DIR=./info_test_downloads
-TRANSCRIPTS_DIR=./info_test_transcripts
-CACHE_DIR=./info_test_cache
+            config_content = f"""
+DOWNLOADS_DIR={test_dir}/info_test_downloads
+TRANSCRIPTS_DIR={test_dir}/info_test_transcripts
+CACHE_DIR={test_dir}/info_test_cache
 """
             with open(test_config_file, 'w') as f:
                 f.write(config_content)
@@ -219,17 +219,27 @@ CACHE_DIR=./info_test_cache
             temp_file2 = storage_config.cache_dir / "temp_file2.dat"
             normal_file = storage_config.cache_dir / "normal_file.dat"
             
-            temp_file1.touch()
+            temp_file1.write_bytes(b"x" * 10)
             temp_file2.touch()
             normal_file.touch()
             
             # Test cleanup
-            storage_config.cleanup_temp_files("temp_*")
+            bytes_freed, files_removed = storage_config.cleanup_temp_files("temp_*")
             
+            assert bytes_freed == 10
+            assert files_removed == 2
             assert not temp_file1.exists()
             assert not temp_file2.exists()
             assert normal_file.exists()  # Should not be deleted
     
+    def test_cleanup_temp_files_rejects_subdirectory_pattern(self):
+        """Test that cleanup patterns reaching into subdirectories are rejected"""
+        with patch.dict(os.environ, {}, clear=True):
+            storage_config = StorageConfig(config_file=str(self.config_file))
+            
+            with pytest.raises(ValueError):
+                storage_config.cleanup_temp_files("sub/temp_*")
+    
     def test_config_file_not_exists(self):
         """Test behavior when config file doesn't exist"""
         non_existent_config = self.temp_dir / "non_existent.env"
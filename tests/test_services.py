@@ -30,6 +30,7 @@ class TestTranscriptionService:
     """Test the core TranscriptionService"""
     
     def setup_method(self):
+        TranscriptionService._model_cache.clear()
         self.service = TranscriptionService()
     
     def test_init(self):
@@ -37,6 +38,7 @@ class TestTranscriptionService:
         assert self.service is not None
         assert hasattr(self.service, 'transcribe_audio')
     
+    @patch('src.services.transcription_service.FASTER_WHISPER_AVAILABLE', False)
     @patch('os.path.exists')
     @patch('whisper.load_model')
     def test_load_cached_model(self, mock_load_model, mock_exists):
@@ -51,12 +53,36 @@ class TestTranscriptionService:
         mock_load_model.assert_called()
         
         # Test loading with cache directory available
+        TranscriptionService._model_cache.clear()
         mock_load_model.reset_mock()
         mock_exists.return_value = True  # Cache directory exists
         model2 = self.service._load_cached_model("turbo")
         assert model2 is not None
         # Should call load_model with download_root parameter
         mock_load_model.assert_called_with("turbo", download_root="/model")
+    
+    @patch('src.services.transcription_service.FASTER_WHISPER_AVAILABLE', False)
+    @patch('whisper.load_model')
+    def test_load_cached_model_reused_across_instances(self, mock_load_model):
+        """Test that a loaded model is shared instead of reloaded per service"""
+        model = self.service._load_cached_model("turbo")
+        model2 = TranscriptionService()._load_cached_model("turbo")
+        
+        assert model2 is model
+        mock_load_model.assert_called_once()
+    
+    @patch('src.services.transcription_service.FASTER_WHISPER_AVAILABLE', True)
+    @patch('src.services.transcription_service.detect_compute_type', return_value=("cpu", "int8"))
+    @patch('os.path.exists', return_value=True)
+    def test_load_cached_model_faster_whisper(self, mock_exists, mock_detect):
+        """Test that the CTranslate2 backend is preferred when installed"""
+        with patch('src.services.transcription_service.WhisperModel', create=True) as mock_whisper_model:
+            model = self.service._load_cached_model("turbo")
+        
+        assert model is mock_whisper_model.return_value
+        mock_whisper_model.assert_called_with(
+            "turbo", device="cpu", compute_type="int8", download_root="/model"
+        )
 
 
 class TestDistributedTranscriptionService:
@@ -206,6 +232,39 @@ class TestModalTranscriptionService:
 # Downloads are now handled locally by PodcastDownloadService (tested below)
 
 
+class TestPodcastDownloadService:
+    """Test the PodcastDownloadService helpers"""
+    
+    def test_compile_selectors_is_cached(self):
+        """Test selector lists are compiled once and reused"""
+        from src.services.podcast_download_service import (
+            _compile_selectors,
+            APPLE_TITLE_SELECTORS
+        )
+        
+        first = _compile_selectors(APPLE_TITLE_SELECTORS)
+        hits = _compile_selectors.cache_info().hits
+        second = _compile_selectors(APPLE_TITLE_SELECTORS)
+        
+        assert second is first
+        assert _compile_selectors.cache_info().hits == hits + 1
+    
+    def test_find_audio_url_with_equals_sign(self):
+        """Test audio URLs containing '=' before the extension are matched whole"""
+        service = PodcastDownloadService(default_output_folder=tempfile.gettempdir())
+        signed_url = "https://cdn.example.com/token=abc123/ep?sig=x%3D/episode.mp3"
+        html = f'<a href="https://example.com/a.mp3">a</a><audio src="{signed_url}"></audio>'
+        
+        assert service._find_audio_url_in_html(html) == signed_url
+    
+    def test_find_audio_url_unwraps_redirect(self):
+        """Test tracking redirects resolve to the wrapped CDN URL"""
+        service = PodcastDownloadService(default_output_folder=tempfile.gettempdir())
+        html = '<audio src="https://track.example.com/r?url=https://cdn.example.com/episode.m4a"></audio>'
+        
+        assert service._find_audio_url_in_html(html) == "https://cdn.example.com/episode.m4a"
+
+
 class TestHealthService:
     """Test the HealthService"""
     
@@ -14,7 +14,11 @@ from unittest.mock import Mock, patch, AsyncMock, MagicMock
 import torch
 
 from src.services.distributed_transcription_service import DistributedTranscriptionService
-from src.services.speaker_embedding_service import SpeakerEmbeddingService, SpeakerIdentificationService
+from src.services.speaker_embedding_service import (
+    SpeakerEmbeddingService,
+    SpeakerIdentificationService,
+    EmbeddingCache
+)
 from src.utils.config import AudioProcessingConfig
 
 
@@ -297,7 +301,10 @@ class TestSpeakerEmbeddingWorkflow:
         embedding_service = SpeakerEmbeddingService(
             storage_path=str(Path(self.temp_dir) / "speakers.json")
         )
-        speaker_service = SpeakerIdentificationService(embedding_service)
+        speaker_service = SpeakerIdentificationService(
+            embedding_service,
+            embedding_cache=EmbeddingCache(cache_dir=str(Path(self.temp_dir) / "embedding_cache"))
+        )
         
         # Mock the models
         speaker_service.embedding_model = Mock()
@@ -15,7 +15,8 @@ import torch
 
 from src.services.speaker_embedding_service import (
     SpeakerEmbeddingService, 
-    SpeakerIdentificationService
+    SpeakerIdentificationService,
+    EmbeddingCache
 )
 from src.interfaces.speaker_manager import SpeakerEmbedding, SpeakerSegment
 from src.utils.config import AudioProcessingConfig
@@ -68,8 +69,11 @@ class TestSpeakerEmbeddingService:
         # Save speakers
         await self.service.save_speakers()
         
-        # Verify file exists
+        # Verify files exist: JSON metadata plus the .npz embedding matrix
         assert self.storage_path.exists()
+        assert self.storage_path.with_suffix('.npz').exists()
+        with open(self.storage_path) as f:
+            assert "embedding" not in json.load(f)["speakers"][speaker_id]
         
         # Create new service and load data
         new_service = SpeakerEmbeddingService(storage_path=str(self.storage_path))
@@ -84,7 +88,33 @@ class TestSpeakerEmbeddingService:
         assert loaded_speaker.speaker_id == speaker_id
         assert loaded_speaker.confidence == 0.9
         assert "test.wav" in loaded_speaker.source_files
-        assert np.allclose(loaded_speaker.embedding, embedding)
+        # Embeddings are stored unit-norm and persisted as 8-bit codes:
+        # error is bounded by one quantization step
+        unit_embedding = embedding / np.linalg.norm(embedding)
+        quantization_step = (unit_embedding.max() - unit_embedding.min()) / 255
+        assert np.allclose(loaded_speaker.embedding, unit_embedding, atol=quantization_step)
+    
+    @pytest.mark.asyncio
+    async def test_load_after_interrupted_save(self):
+        """Test that an older JSON still loads against a newer .npz"""
+        first_id = await self.service.add_or_update_speaker(
+            embedding=np.random.rand(512),
+            source_file="first.wav"
+        )
+        await self.service.save_speakers()
+        old_metadata = self.storage_path.read_bytes()
+        
+        # A save interrupted after the .npz swap leaves the previous JSON in place
+        orthogonal = np.zeros(512)
+        orthogonal[0] = 1.0
+        await self.service.add_or_update_speaker(embedding=orthogonal, source_file="second.wav")
+        await self.service.save_speakers()
+        self.storage_path.write_bytes(old_metadata)
+        
+        new_service = SpeakerEmbeddingService(storage_path=str(self.storage_path))
+        await new_service.load_speakers()
+        
+        assert list(new_service.speakers) == [first_id]
     
     @pytest.mark.asyncio
     async def test_find_matching_speaker(self):
@@ -139,7 +169,7 @@ class TestSpeakerEmbeddingService:
         assert speaker.confidence == 0.95
         assert speaker.source_files == ["test.wav"]
         assert speaker.sample_count == 1
-        assert np.allclose(speaker.embedding, embedding)
+        assert np.allclose(speaker.embedding, embedding / np.linalg.norm(embedding))
     
     @pytest.mark.asyncio
     async def test_add_or_update_speaker_existing(self):
@@ -196,6 +226,29 @@ class TestSpeakerEmbeddingService:
         assert mapping["SPEAKER_01"] == "SPEAKER_GLOBAL_002"
         assert len(self.service.speakers) == 2
     
+    @pytest.mark.asyncio
+    async def test_map_local_to_global_speakers_no_merge_within_source(self):
+        """Test that two local labels of one source never share a global ID"""
+        embedding = np.zeros(512)
+        embedding[0] = 1.0
+        existing_id = await self.service.add_or_update_speaker(
+            embedding=embedding,
+            source_file="first.wav"
+        )
+        
+        # Both labels are closest to the existing speaker; only one may take it
+        mapping = await self.service.map_local_to_global_speakers(
+            local_embeddings={
+                "SPEAKER_00": embedding,
+                "SPEAKER_01": embedding + 0.01
+            },
+            source_file="second.wav"
+        )
+        
+        assert mapping["SPEAKER_00"] == existing_id
+        assert mapping["SPEAKER_01"] != existing_id
+        assert len(self.service.speakers) == 2
+    
     @pytest.mark.asyncio
     async def test_get_speaker_info(self):
         """Test getting speaker information"""
@@ -233,6 +286,56 @@ class TestSpeakerEmbeddingService:
         assert len(summary["speakers"]) == 3
 
 
+class TestEmbeddingCache:
+    """Test EmbeddingCache functionality"""
+    
+    def setup_method(self):
+        """Setup test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.audio_path = Path(self.temp_dir) / "audio.wav"
+        self.audio_path.write_bytes(b"RIFF" + bytes(1024))
+        self.cache = EmbeddingCache(cache_dir=str(Path(self.temp_dir) / "cache"))
+    
+    def teardown_method(self):
+        """Cleanup test environment"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_round_trip(self):
+        """Test that a stored embedding is returned for the same segment only"""
+        embedding = np.random.rand(512).astype(np.float32)
+        embedding /= np.linalg.norm(embedding)
+        
+        spans = [(1.0, 2.5), (4.0, 6.0)]
+        
+        audio_key = self.cache.audio_key(str(self.audio_path))
+        assert self.cache.get(audio_key, spans) is None
+        
+        self.cache.put(audio_key, spans, embedding)
+        
+        cached = self.cache.get(audio_key, spans)
+        assert cached.dtype == np.float32
+        np.testing.assert_allclose(cached, embedding, atol=1e-3)
+        assert self.cache.get(audio_key, [(1.0, 2.5)]) is None
+        
+        # A different model never sees another model's vectors
+        other_model = EmbeddingCache(cache_dir=str(self.cache.cache_dir), model_id="other/model")
+        assert other_model.get(audio_key, spans) is None
+    
+    def test_same_head_different_episodes(self):
+        """Test that files sharing a large identical head get different keys"""
+        head = bytes(EmbeddingCache.HASH_BYTES + 1024)
+        first = Path(self.temp_dir) / "episode1.mp3"
+        second = Path(self.temp_dir) / "episode2.mp3"
+        first.write_bytes(head + b"episode one audio")
+        second.write_bytes(head + b"episode two audio")
+        
+        assert self.cache.audio_key(str(first)) != self.cache.audio_key(str(second))
+    
+    def test_missing_audio_file(self):
+        """Test that an unreadable audio file bypasses the cache"""
+        assert self.cache.audio_key(str(Path(self.temp_dir) / "missing.wav")) is None
+
+
 class TestSpeakerIdentificationService:
     """Test SpeakerIdentificationService functionality"""
     
@@ -241,9 +344,11 @@ class TestSpeakerIdentificationService:
         self.temp_dir = tempfile.mkdtemp()
         self.config = AudioProcessingConfig()
         self.embedding_manager = SpeakerEmbeddingService()
+        self.embedding_cache = EmbeddingCache(cache_dir=str(Path(self.temp_dir) / "cache"))
         self.service = SpeakerIdentificationService(
             embedding_manager=self.embedding_manager,
-            config=self.config
+            config=self.config,
+            embedding_cache=self.embedding_cache
         )
     
     def teardown_method(self):
@@ -261,7 +366,8 @@ class TestSpeakerIdentificationService:
         """Test initialization with HF token"""
         service = SpeakerIdentificationService(
             embedding_manager=self.embedding_manager,
-            config=self.config
+            config=self.config,
+            embedding_cache=self.embedding_cache
         )
         assert service.available
         assert service.auth_token == 'test_token'
@@ -283,14 +389,14 @@ class TestSpeakerIdentificationService:
         # Mock the service as available
         service = SpeakerIdentificationService(
             embedding_manager=self.embedding_manager,
-            config=self.config
+            config=self.config,
+            embedding_cache=self.embedding_cache
         )
         
-        # Mock the models and inference
-        mock_model = Mock()
-        mock_inference = Mock()
-        mock_waveform = torch.rand(1, 16000)  # 1 second of audio
-        mock_embedding = torch.rand(512)
+        # Mock the model: one batched forward pass for all unique speakers
+        mock_model = Mock(return_value=torch.rand(2, 512))
+        mock_model.device = torch.device("cpu")
+        mock_waveform = torch.rand(1, 48000)  # 3 seconds of audio
         
         service.embedding_model = mock_model
         
@@ -300,13 +406,13 @@ class TestSpeakerIdentificationService:
             SpeakerSegment(start=2.0, end=3.0, speaker_id="SPEAKER_00", confidence=1.0)  # Same speaker
         ]
         
-        with patch('torchaudio.load', return_value=(mock_waveform, 16000)), \
-             patch('pyannote.audio.core.inference.Inference', return_value=mock_inference):
-            
-            mock_inference.crop.return_value = mock_embedding
-            
+        with patch('torchaudio.load', return_value=(mock_waveform, 16000)):
             embeddings = await service.extract_speaker_embeddings("test.wav", segments)
             
+            # Both speakers are embedded in a single batch; SPEAKER_00's two turns
+            # are pooled into one 2 second clip
+            assert mock_model.call_count == 1
+            assert mock_model.call_args[0][0].shape == (2, 1, 32000)
             # Should have embeddings for 2 unique speakers
             assert len(embeddings) == 2
             assert "SPEAKER_00" in embeddings
@@ -314,6 +420,30 @@ class TestSpeakerIdentificationService:
             assert isinstance(embeddings["SPEAKER_00"], np.ndarray)
             assert isinstance(embeddings["SPEAKER_01"], np.ndarray)
     
+    @pytest.mark.asyncio
+    async def test_map_transcription_to_speakers(self):
+        """Test that each transcription segment takes the speaker with the largest overlap"""
+        speaker_segments = [
+            SpeakerSegment(start=0.0, end=4.0, speaker_id="SPEAKER_00", confidence=1.0),
+            SpeakerSegment(start=4.0, end=10.0, speaker_id="SPEAKER_01", confidence=1.0)
+        ]
+        transcription_segments = [
+            {"start": 0.0, "end": 3.0, "text": "Hello"},
+            {"start": 3.0, "end": 8.0, "text": "World"},  # 1s vs 4s overlap
+            {"start": 12.0, "end": 14.0, "text": "Silence"}  # No overlap
+        ]
+        
+        result = await self.service.map_transcription_to_speakers(transcription_segments, speaker_segments)
+        
+        assert [seg["speaker"] for seg in result] == ["SPEAKER_00", "SPEAKER_01", None]
+        assert result[0]["text"] == "Hello"
+        assert "speaker" not in transcription_segments[0]
+        
+        # Large inputs take the sorted-sweep path and must agree
+        with patch('src.services.speaker_embedding_service.OVERLAP_MATRIX_MAX_CELLS', 0):
+            swept = await self.service.map_transcription_to_speakers(transcription_segments, speaker_segments)
+        assert [seg["speaker"] for seg in swept] == ["SPEAKER_00", "SPEAKER_01", None]
+    
     @pytest.mark.asyncio
     async def test_identify_speakers_in_audio_not_available(self):
         """Test speaker identification when service not available"""
@@ -327,11 +457,13 @@ class TestSpeakerIdentificationService:
         # Mock the service as available
         service = SpeakerIdentificationService(
             embedding_manager=self.embedding_manager,
-            config=self.config
+            config=self.config,
+            embedding_cache=self.embedding_cache
         )
         
         # Mock models
         service.embedding_model = Mock()
+        service.embedding_model.device = torch.device("cpu")
         
         # Create mock chunk results with speaker information
         chunk_results = [
@@ -360,21 +492,15 @@ class TestSpeakerIdentificationService:
         speaker_00_embedding = np.random.rand(512)
         speaker_01_embedding = np.random.rand(512)
         
-        def mock_crop_side_effect(waveform, segment):
-            # Return similar embeddings for same speakers across chunks
-            if "chunk_0_SPEAKER_00" in str(segment) or "chunk_1_SPEAKER_00" in str(segment):
-                return torch.tensor(speaker_00_embedding + np.random.normal(0, 0.01, 512))
-            else:  # SPEAKER_01
-                return torch.tensor(speaker_01_embedding + np.random.normal(0, 0.01, 512))
+        # Batch rows follow first appearance: chunk_0_S00, chunk_0_S01, chunk_1_S00, chunk_1_S01
+        service.embedding_model.return_value = torch.tensor(np.stack([
+            speaker_00_embedding + np.random.normal(0, 0.01, 512),
+            speaker_01_embedding + np.random.normal(0, 0.01, 512),
+            speaker_00_embedding + np.random.normal(0, 0.01, 512),
+            speaker_01_embedding + np.random.normal(0, 0.01, 512),
+        ]))
         
-        mock_inference = Mock()
-        mock_inference.crop.side_effect = mock_crop_side_effect
-        
-        with patch('torchaudio.load', return_value=(mock_waveform, 16000)), \
-             patch('pyannote.audio.core.inference.Inference', return_value=mock_inference):
-            
-            mock_inference.crop.side_effect = mock_crop_side_effect
-            
+        with patch('torchaudio.load', return_value=(mock_waveform, 16000)):
             mapping = await service.unify_distributed_speakers(chunk_results, "test.wav")
             
             # Should have mappings for all chunk speakers